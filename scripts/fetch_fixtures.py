@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
+import random
+import re
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import httpx
+import orjson
 import websockets
 from websockets.exceptions import WebSocketException
 
@@ -16,6 +18,11 @@ GAMMA_BASE = "https://gamma-api.polymarket.com"
 DATA_BASE = "https://data-api.polymarket.com"
 CLOB_BASE = "https://clob.polymarket.com"
 WSS_BASE = "wss://ws-subscriptions-clob.polymarket.com"
+WS_URL_CACHE = Path(".ws_url_cache")
+WS_BACKOFF_BASE_SECONDS = 0.25
+WS_BACKOFF_CAP_SECONDS = 4.0
+
+_ARRAY_ITEM_RE = re.compile(r"""\s*["']*(.*?)["']*\s*(?:,|\Z)""", re.DOTALL)
 
 
 def parse_jsonish_array(value: Any) -> list[str]:
@@ -25,44 +32,55 @@ def parse_jsonish_array(value: Any) -> list[str]:
         return [str(item) for item in value if item is not None]
     if isinstance(value, str):
         stripped = value.strip()
-        if not stripped:
+        if not stripped or stripped == "[]":
             return []
+        if not stripped.startswith("["):
+            return [stripped]
         try:
-            parsed = json.loads(stripped)
-        except json.JSONDecodeError:
+            parsed = orjson.loads(stripped)
+        except orjson.JSONDecodeError:
             parsed = None
         if isinstance(parsed, list):
             return [str(item) for item in parsed if item is not None]
-        if stripped.startswith("[") and stripped.endswith("]"):
-            inner = stripped[1:-1].strip()
-            if not inner:
-                return []
-            parts = [part.strip() for part in inner.split(",")]
-            return [part.strip("\"'") for part in parts if part.strip("\"'")]
+        if stripped.endswith("]"):
+            return [item for item in _ARRAY_ITEM_RE.findall(stripped[1:-1]) if item]
         return [stripped]
     return [str(value)]
 
 
 def write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2, sort_keys=True, ensure_ascii=True)
-        handle.write("\n")
+    path.write_bytes(
+        orjson.dumps(
+            payload,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_SORT_KEYS
+            | orjson.OPT_APPEND_NEWLINE,
+        )
+    )
 
 
-def get_json(
-    client: httpx.Client, url: str, params: dict[str, Any] | None = None
+async def get_json(
+    client: httpx.AsyncClient, url: str, params: dict[str, Any] | None = None
 ) -> Any:
-    response = client.get(url, params=params)
+    response = await client.get(url, params=params)
     response.raise_for_status()
     return response.json()
 
 
-def fetch_book_for_tokens(
-    client: httpx.Client, token_ids: list[str]
+async def fetch_book_for_tokens(
+    client: httpx.AsyncClient, token_ids: list[str]
 ) -> tuple[str, dict[str, Any]]:
-    for token_id in token_ids:
-        response = client.get(f"{CLOB_BASE}/book", params={"token_id": token_id})
+    responses = await asyncio.gather(
+        *(
+            client.get(f"{CLOB_BASE}/book", params={"token_id": token_id})
+            for token_id in token_ids
+        ),
+        return_exceptions=True,
+    )
+    for token_id, response in zip(token_ids, responses):
+        if isinstance(response, BaseException):
+            raise response
         if response.status_code == 404:
             continue
         response.raise_for_status()
@@ -70,8 +88,14 @@ def fetch_book_for_tokens(
     raise RuntimeError("No CLOB orderbook found for token candidates.")
 
 
+def read_cached_ws_url(cache_path: Path | None) -> str | None:
+    if cache_path is None or not cache_path.is_file():
+        return None
+    return cache_path.read_text(encoding="utf-8").strip() or None
+
+
 async def fetch_ws_book(
-    asset_id: str, timeout_seconds: float
+    asset_id: str, timeout_seconds: float, cache_path: Path | None = None
 ) -> tuple[str, dict[str, Any]]:
     ws_urls = [
         f"{WSS_BASE}/ws/market",
@@ -79,14 +103,26 @@ async def fetch_ws_book(
         f"{WSS_BASE}/ws/",
         f"{WSS_BASE}/ws",
     ]
+    cached_url = read_cached_ws_url(cache_path)
+    if cached_url in ws_urls:
+        ws_urls.remove(cached_url)
+        ws_urls.insert(0, cached_url)
+
     last_error: Exception | None = None
+    failures = 0
     for ws_url in ws_urls:
+        if failures:
+            delay = min(WS_BACKOFF_CAP_SECONDS, WS_BACKOFF_BASE_SECONDS * 2**failures)
+            await asyncio.sleep(random.uniform(0, delay))
         try:
             data = await fetch_ws_book_from_url(ws_url, asset_id, timeout_seconds)
-            return ws_url, data
         except (TimeoutError, WebSocketException) as exc:
             last_error = exc
+            failures += 1
             continue
+        if cache_path is not None:
+            cache_path.write_text(f"{ws_url}\n", encoding="utf-8")
+        return ws_url, data
     raise TimeoutError("Timed out waiting for websocket book message.") from last_error
 
 
@@ -102,15 +138,18 @@ async def fetch_ws_book_from_url(
 
     async with websockets.connect(ws_url) as socket:
         for payload in payloads:
-            await socket.send(json.dumps(payload))
+            await socket.send(orjson.dumps(payload).decode())
         while True:
             remaining = deadline - time.monotonic()
             if remaining <= 0:
                 raise TimeoutError("Timed out waiting for websocket book message.")
             message = await asyncio.wait_for(socket.recv(), timeout=remaining)
+            marker = b'"book"' if isinstance(message, bytes) else '"book"'
+            if marker not in message:
+                continue
             try:
-                data = json.loads(message)
-            except json.JSONDecodeError:
+                data = orjson.loads(message)
+            except orjson.JSONDecodeError:
                 continue
             if isinstance(data, dict) and data.get("event_type") == "book":
                 return data
@@ -148,9 +187,7 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main() -> None:
-    parser = build_parser()
-    args = parser.parse_args()
+async def main_async(args: argparse.Namespace) -> None:
     out_dir = Path(args.output_dir)
 
     manifest: dict[str, Any] = {
@@ -161,7 +198,13 @@ def main() -> None:
         "notes": [],
     }
 
-    with httpx.Client(timeout=15.0) as client:
+    async with httpx.AsyncClient(
+        timeout=15.0,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=20, max_keepalive_connections=20, keepalive_expiry=30.0
+        ),
+    ) as client:
         events_params = {
             "active": "true",
             "closed": "false",
@@ -170,7 +213,7 @@ def main() -> None:
             "order": "id",
             "ascending": "false",
         }
-        events = get_json(client, f"{GAMMA_BASE}/events", params=events_params)
+        events = await get_json(client, f"{GAMMA_BASE}/events", params=events_params)
         if not events:
             raise RuntimeError("Gamma /events returned no data.")
         write_json(out_dir / "gamma_events.json", events)
@@ -191,7 +234,7 @@ def main() -> None:
                 if not candidate_condition_id or not candidate_token_ids:
                     continue
                 try:
-                    book_token_id, book = fetch_book_for_tokens(
+                    book_token_id, book = await fetch_book_for_tokens(
                         client, candidate_token_ids
                     )
                 except RuntimeError:
@@ -211,6 +254,10 @@ def main() -> None:
         if not book_token_id:
             raise RuntimeError("Selected market missing book token id.")
 
+        ws_task = asyncio.create_task(
+            fetch_ws_book(book_token_id, args.ws_timeout, WS_URL_CACHE)
+        )
+
         manifest["gamma"] = {
             "events_params": events_params,
             "event_id": event.get("id"),
@@ -220,10 +267,6 @@ def main() -> None:
         }
 
         oi_params = {"market": condition_id}
-        oi = get_json(client, f"{DATA_BASE}/oi", params=oi_params)
-        write_json(out_dir / "data_oi.json", oi)
-        manifest["data_api"]["oi_params"] = oi_params
-
         trades_params = {
             "limit": 5,
             "offset": 0,
@@ -232,10 +275,16 @@ def main() -> None:
             "filterAmount": 10000,
             "market": condition_id,
         }
-        trades = get_json(client, f"{DATA_BASE}/trades", params=trades_params)
+        oi, trades = await asyncio.gather(
+            get_json(client, f"{DATA_BASE}/oi", params=oi_params),
+            get_json(client, f"{DATA_BASE}/trades", params=trades_params),
+        )
+        write_json(out_dir / "data_oi.json", oi)
+        manifest["data_api"]["oi_params"] = oi_params
+
         if not trades and args.allow_trades_fallback:
             trades_params.pop("market")
-            trades = get_json(client, f"{DATA_BASE}/trades", params=trades_params)
+            trades = await get_json(client, f"{DATA_BASE}/trades", params=trades_params)
             manifest["notes"].append("trades_fallback_without_market_filter")
         elif not trades:
             manifest["notes"].append("trades_empty_for_market_filter")
@@ -248,7 +297,7 @@ def main() -> None:
             wallet = trades[0].get("proxyWallet")
         if wallet:
             positions_params = {"user": wallet, "limit": 5, "offset": 0}
-            positions = get_json(
+            positions = await get_json(
                 client, f"{DATA_BASE}/positions", params=positions_params
             )
             manifest["data_api"]["positions_params"] = positions_params
@@ -265,7 +314,7 @@ def main() -> None:
     ws_book = None
     ws_error = None
     try:
-        ws_url, ws_book = asyncio.run(fetch_ws_book(book_token_id, args.ws_timeout))
+        ws_url, ws_book = await ws_task
     except Exception as exc:  # pragma: no cover - best-effort network path
         ws_error = str(exc)
 
@@ -294,5 +343,11 @@ def main() -> None:
     write_json(out_dir / "fixtures_manifest.json", manifest)
 
 
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
 if __name__ == "__main__":
     main()
@@ -1,15 +1,67 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, and_, bindparam, func, insert, or_, select
 from sqlalchemy.orm import Session
 
 from polymercado.config import AppSettings
-from polymercado.models import AlertAck, AlertLog, AlertRule, AlertStatus, SignalEvent
-from polymercado.utils import utc_now
+from polymercado.ingestion.http import get_client
+from polymercado.models import (
+    AlertAck,
+    AlertLog,
+    AlertRule,
+    AlertStatus,
+    SignalEvent,
+    SignalType,
+)
+from polymercado.utils import ensure_utc, utc_now
+
+RuleMatcher = Callable[[SignalEvent, datetime], bool]
+
+_ENABLED_RULES_STMT = (
+    select(AlertRule)
+    .where(AlertRule.enabled.is_(True))
+    .order_by(AlertRule.priority.asc())
+)
+_PENDING_SIGNALS_STMT = (
+    select(SignalEvent)
+    .outerjoin(AlertLog, AlertLog.signal_event_id == SignalEvent.id)
+    .where(AlertLog.signal_event_id.is_(None))
+)
+_RANKED_LOGS = (
+    select(
+        AlertLog.notification_key,
+        AlertLog.sent_at,
+        AlertLog.severity,
+        func.row_number()
+        .over(
+            partition_by=AlertLog.notification_key,
+            order_by=AlertLog.sent_at.desc(),
+        )
+        .label("rank"),
+    )
+    .where(
+        AlertLog.notification_key.in_(bindparam("notification_keys", expanding=True))
+    )
+    .subquery()
+)
+_LATEST_LOGS_STMT = select(
+    _RANKED_LOGS.c.notification_key,
+    _RANKED_LOGS.c.sent_at,
+    _RANKED_LOGS.c.severity,
+).where(_RANKED_LOGS.c.rank == 1)
+_LATEST_ACKS_STMT = (
+    select(AlertAck.notification_key, func.max(AlertAck.acked_until))
+    .where(
+        AlertAck.notification_key.in_(bindparam("notification_keys", expanding=True))
+    )
+    .group_by(AlertAck.notification_key)
+)
 
 
 def dispatch_alerts(session: Session, settings: AppSettings) -> int:
@@ -22,46 +74,48 @@ def dispatch_alerts(session: Session, settings: AppSettings) -> int:
     if not default_channels:
         return 0
 
-    rules = []
+    compiled_rules: list[tuple[RuleMatcher, dict[str, Any]]] = []
+    pending_stmt = _PENDING_SIGNALS_STMT.where(
+        SignalEvent.severity >= settings.ALERT_MIN_SEVERITY
+    )
     if settings.ALERT_RULES_ENABLED:
-        rules = (
-            session.execute(
-                select(AlertRule)
-                .where(AlertRule.enabled.is_(True))
-                .order_by(AlertRule.priority.asc())
-            )
-            .scalars()
-            .all()
-        )
+        rules = session.execute(_ENABLED_RULES_STMT).scalars().all()
+        compiled_rules = [(compile_rule(rule.rule), rule.rule) for rule in rules]
+        rule_clauses = [rule_clause(rule.rule) for rule in rules]
+        if rule_clauses and all(clause is not None for clause in rule_clauses):
+            pending_stmt = pending_stmt.where(or_(*rule_clauses))
 
     sent = 0
-    existing = select(AlertLog.signal_event_id).distinct().subquery()
-    signals = (
-        session.execute(select(SignalEvent).where(~SignalEvent.id.in_(existing)))
-        .scalars()
-        .all()
+    signals = session.execute(pending_stmt).scalars().all()
+    pending = [(signal, build_notification_key(signal)) for signal in signals]
+    if not pending:
+        return 0
+
+    acked_until_by_key = (
+        _acked_until(session, sorted({key for _, key in pending}))
+        if settings.ALERT_ACK_ENABLED
+        else {}
     )
 
     now = utc_now()
+    log_rows: list[dict[str, Any]] = []
+    routed: list[tuple[SignalEvent, str, list[str], int]] = []
 
-    for signal in signals:
-        if signal.severity < settings.ALERT_MIN_SEVERITY:
-            continue
-
-        notification_key = build_notification_key(signal)
-        if settings.ALERT_ACK_ENABLED and _is_acked(session, notification_key, now):
+    for signal, notification_key in pending:
+        acked_until = acked_until_by_key.get(notification_key)
+        if acked_until and acked_until >= now:
             _log_alert(
-                session, signal, notification_key, AlertStatus.SUPPRESSED, "acked"
+                log_rows, signal, notification_key, AlertStatus.SUPPRESSED, "acked"
             )
             continue
 
         channels = default_channels
         cooldown_seconds = settings.ALERT_DEDUP_WINDOW_SECONDS
-        if rules:
+        if compiled_rules:
             matched = False
-            for rule in rules:
-                if rule_matches(rule.rule, signal, now):
-                    actions = (rule.rule or {}).get("actions", {})
+            for matcher, rule in compiled_rules:
+                if matcher(signal, now):
+                    actions = (rule or {}).get("actions", {})
                     channels = actions.get("channels") or default_channels
                     if isinstance(channels, str):
                         channels = [channels]
@@ -70,33 +124,40 @@ def dispatch_alerts(session: Session, settings: AppSettings) -> int:
                     break
             if not matched:
                 continue
+        routed.append((signal, notification_key, channels, cooldown_seconds))
+
+    dedupe_keys = sorted({key for _, key, _, cooldown in routed if cooldown > 0})
+    latest_by_key = _latest_logs(session, dedupe_keys) if dedupe_keys else {}
 
-        dedupe_window = now - timedelta(seconds=cooldown_seconds)
-        latest = (
-            session.execute(
-                select(AlertLog)
-                .where(AlertLog.notification_key == notification_key)
-                .order_by(AlertLog.sent_at.desc())
-                .limit(1)
+    for signal, notification_key, channels, cooldown_seconds in routed:
+        if cooldown_seconds > 0:
+            dedupe_window = now - timedelta(seconds=cooldown_seconds)
+            latest_sent_at, latest_severity = latest_by_key.get(
+                notification_key, (None, None)
             )
-            .scalars()
-            .first()
-        )
-        if latest and latest.sent_at and latest.sent_at >= dedupe_window:
-            if latest.severity is not None and latest.severity >= signal.severity:
+            if (
+                latest_sent_at
+                and latest_sent_at >= dedupe_window
+                and latest_severity is not None
+                and latest_severity >= signal.severity
+            ):
                 _log_alert(
-                    session, signal, notification_key, AlertStatus.SUPPRESSED, None
+                    log_rows, signal, notification_key, AlertStatus.SUPPRESSED, None
                 )
+                latest_by_key[notification_key] = (now, signal.severity)
                 continue
 
         for channel in channels:
             status, error = send_alert(channel, signal, settings)
             _log_alert(
-                session, signal, notification_key, status, error, channel=channel
+                log_rows, signal, notification_key, status, error, channel=channel
             )
             if status == AlertStatus.SENT:
                 sent += 1
+        latest_by_key[notification_key] = (now, signal.severity)
 
+    if log_rows:
+        session.execute(insert(AlertLog), log_rows)
     session.commit()
     return sent
 
@@ -109,81 +170,186 @@ def build_notification_key(signal: SignalEvent) -> str:
     return f"{signal.signal_type}:{signal.id}"
 
 
-def _is_acked(session: Session, notification_key: str, now: datetime) -> bool:
-    row = (
-        session.execute(
-            select(AlertAck)
-            .where(AlertAck.notification_key == notification_key)
-            .order_by(AlertAck.acked_until.desc())
-            .limit(1)
-        )
-        .scalars()
-        .first()
-    )
-    return bool(row and row.acked_until and row.acked_until >= now)
+def _latest_logs(
+    session: Session, notification_keys: list[str]
+) -> dict[str, tuple[datetime | None, int | None]]:
+    rows = session.execute(
+        _LATEST_LOGS_STMT, {"notification_keys": notification_keys}
+    ).all()
+    return {
+        row.notification_key: (ensure_utc(row.sent_at), row.severity) for row in rows
+    }
+
+
+def _acked_until(session: Session, notification_keys: list[str]) -> dict[str, datetime]:
+    rows = session.execute(
+        _LATEST_ACKS_STMT, {"notification_keys": notification_keys}
+    ).all()
+    return {key: ensure_utc(acked_until) for key, acked_until in rows if acked_until}
 
 
 def rule_matches(rule: dict[str, Any], signal: SignalEvent, now: datetime) -> bool:
+    return compile_rule(rule)(signal, now)
+
+
+def rule_clause(rule: dict[str, Any]) -> ColumnElement[bool] | None:
+    when = rule.get("when", {})
+    clauses: list[ColumnElement[bool]] = []
+
+    signal_types = when.get("signal_type")
+    if signal_types:
+        if isinstance(signal_types, str):
+            signal_types = [signal_types]
+        clauses.append(
+            SignalEvent.signal_type.in_(
+                [SignalType[t] for t in signal_types if t in SignalType.__members__]
+            )
+        )
+    min_severity = when.get("min_severity")
+    if min_severity is not None:
+        clauses.append(SignalEvent.severity >= int(min_severity))
+    max_severity = when.get("max_severity")
+    if max_severity is not None:
+        clauses.append(SignalEvent.severity <= int(max_severity))
+
+    if not clauses:
+        return None
+    return and_(*clauses)
+
+
+def compile_rule(rule: dict[str, Any]) -> RuleMatcher:
     when = rule.get("when", {})
     if not when:
-        return True
+        return _match_any_signal
+
+    checks: list[RuleMatcher] = []
 
     signal_types = when.get("signal_type")
     if signal_types:
         if isinstance(signal_types, str):
             signal_types = [signal_types]
-        if signal.signal_type not in signal_types:
-            return False
+        allowed_types = frozenset(signal_types)
+        checks.append(lambda signal, now: signal.signal_type in allowed_types)
 
     min_severity = when.get("min_severity")
-    if min_severity is not None and signal.severity < int(min_severity):
-        return False
+    if min_severity is not None:
+        min_level = int(min_severity)
+        checks.append(lambda signal, now: signal.severity >= min_level)
     max_severity = when.get("max_severity")
-    if max_severity is not None and signal.severity > int(max_severity):
-        return False
+    if max_severity is not None:
+        max_level = int(max_severity)
+        checks.append(lambda signal, now: signal.severity <= max_level)
+
+    payload_min = [
+        (key, float(threshold))
+        for key, threshold in when.get("payload_min", {}).items()
+    ]
+    if payload_min:
+        checks.append(partial(_check_payload_min, payload_min))
+
+    payload_max = [
+        (key, float(threshold))
+        for key, threshold in when.get("payload_max", {}).items()
+    ]
+    if payload_max:
+        checks.append(partial(_check_payload_max, payload_max))
+
+    payload_eq = list(when.get("payload_eq", {}).items())
+    if payload_eq:
+        checks.append(partial(_check_payload_eq, payload_eq))
+
+    payload_any = [
+        (key, expected_set)
+        for key, expected in when.get("payload_any", {}).items()
+        if (expected_set := _payload_values(expected))
+    ]
+    if payload_any:
+        checks.append(partial(_check_payload_any, payload_any))
 
-    payload_min = when.get("payload_min", {})
-    for key, threshold in payload_min.items():
+    payload_not_any = [
+        (key, expected_set)
+        for key, expected in when.get("payload_not_any", {}).items()
+        if (expected_set := _payload_values(expected))
+    ]
+    if payload_not_any:
+        checks.append(partial(_check_payload_not_any, payload_not_any))
+
+    quiet = when.get("quiet_hours")
+    if quiet:
+        start = quiet.get("start")
+        end = quiet.get("end")
+        if start is not None and end is not None:
+            quiet_mask = _quiet_hours_mask(start, end)
+            if quiet_mask:
+                checks.append(lambda signal, now: not (quiet_mask >> now.hour) & 1)
+
+    if not checks:
+        return _match_any_signal
+    if len(checks) == 1:
+        return checks[0]
+
+    def matcher(signal: SignalEvent, now: datetime) -> bool:
+        for check in checks:
+            if not check(signal, now):
+                return False
+        return True
+
+    return matcher
+
+
+def _match_any_signal(signal: SignalEvent, now: datetime) -> bool:
+    return True
+
+
+def _check_payload_min(
+    thresholds: list[tuple[str, float]], signal: SignalEvent, now: datetime
+) -> bool:
+    for key, threshold in thresholds:
         value = _payload_number(signal.payload, key)
-        if value is None or value < float(threshold):
+        if value is None or value < threshold:
             return False
+    return True
 
-    payload_max = when.get("payload_max", {})
-    for key, threshold in payload_max.items():
+
+def _check_payload_max(
+    thresholds: list[tuple[str, float]], signal: SignalEvent, now: datetime
+) -> bool:
+    for key, threshold in thresholds:
         value = _payload_number(signal.payload, key)
-        if value is None or value > float(threshold):
+        if value is None or value > threshold:
             return False
+    return True
+
 
-    payload_eq = when.get("payload_eq", {})
-    for key, expected in payload_eq.items():
-        if signal.payload.get(key) != expected:
+def _check_payload_eq(
+    expected: list[tuple[str, Any]], signal: SignalEvent, now: datetime
+) -> bool:
+    payload = signal.payload
+    for key, value in expected:
+        if payload.get(key) != value:
             return False
+    return True
 
-    payload_any = when.get("payload_any", {})
-    for key, expected in payload_any.items():
-        expected_set = _payload_values(expected)
-        if not expected_set:
-            continue
-        actual_set = _payload_values(signal.payload.get(key))
+
+def _check_payload_any(
+    expected: list[tuple[str, set[str]]], signal: SignalEvent, now: datetime
+) -> bool:
+    payload = signal.payload
+    for key, expected_set in expected:
+        actual_set = _payload_values(payload.get(key))
         if not actual_set or actual_set.isdisjoint(expected_set):
             return False
+    return True
 
-    payload_not_any = when.get("payload_not_any", {})
-    for key, expected in payload_not_any.items():
-        expected_set = _payload_values(expected)
-        if not expected_set:
-            continue
-        actual_set = _payload_values(signal.payload.get(key))
-        if actual_set and not actual_set.isdisjoint(expected_set):
-            return False
 
-    quiet = when.get("quiet_hours")
-    if quiet:
-        start = quiet.get("start")
-        end = quiet.get("end")
-        if start is not None and end is not None and _in_quiet_hours(now, start, end):
+def _check_payload_not_any(
+    expected: list[tuple[str, set[str]]], signal: SignalEvent, now: datetime
+) -> bool:
+    payload = signal.payload
+    for key, expected_set in expected:
+        actual_set = _payload_values(payload.get(key))
+        if actual_set and not actual_set.isdisjoint(expected_set):
             return False
-
     return True
 
 
@@ -209,8 +375,15 @@ def _payload_values(value: Any) -> set[str]:
     return normalized
 
 
-def _in_quiet_hours(now: datetime, start_hour: int, end_hour: int) -> bool:
-    hour = now.hour
+def _quiet_hours_mask(start_hour: int, end_hour: int) -> int:
+    mask = 0
+    for hour in range(24):
+        if _hour_in_range(hour, start_hour, end_hour):
+            mask |= 1 << hour
+    return mask
+
+
+def _hour_in_range(hour: int, start_hour: int, end_hour: int) -> bool:
     if start_hour == end_hour:
         return False
     if start_hour < end_hour:
@@ -230,7 +403,9 @@ def send_alert(
         if not webhook:
             return AlertStatus.FAILED, "missing_slack_webhook"
         try:
-            httpx.post(webhook, json={"text": message}, timeout=10.0).raise_for_status()
+            get_client(settings).post(
+                webhook, json={"text": message}
+            ).raise_for_status()
             return AlertStatus.SENT, None
         except httpx.HTTPError as exc:
             return AlertStatus.FAILED, str(exc)
@@ -242,7 +417,7 @@ def send_alert(
         url = f"https://api.telegram.org/bot{token}/sendMessage"
         payload = {"chat_id": chat_id, "text": message}
         try:
-            httpx.post(url, json=payload, timeout=10.0).raise_for_status()
+            get_client(settings).post(url, json=payload).raise_for_status()
             return AlertStatus.SENT, None
         except httpx.HTTPError as exc:
             return AlertStatus.FAILED, str(exc)
@@ -251,43 +426,54 @@ def send_alert(
 
 
 def format_message(signal: SignalEvent) -> str:
+    formatter = _MESSAGE_FORMATTERS.get(signal.signal_type, _format_default)
+    return formatter(signal)
+
+
+def _format_arb(signal: SignalEvent) -> str:
     payload = signal.payload
-    prefix = f"[SEV{signal.severity}]"
-    if signal.signal_type == "ARB_BUY_BOTH":
-        edge = payload.get("edge_at_q_max")
-        q_max = payload.get("q_max")
+    edge = payload.get("edge_at_q_max")
+    q_max = payload.get("q_max")
+    edge_pct = None
+    try:
+        edge_pct = float(edge) * 100 if edge is not None else None
+    except (TypeError, ValueError):
         edge_pct = None
-        try:
-            edge_pct = float(edge) * 100 if edge is not None else None
-        except (TypeError, ValueError):
-            edge_pct = None
-        edge_label = f"{edge_pct:.2f}%" if edge_pct is not None else str(edge)
-        return f"{prefix} Arb buy-both {edge_label} edge @ {q_max} shares"
-    if signal.signal_type in {"LARGE_TAKER_TRADE", "LARGE_NEW_WALLET_TRADE"}:
-        kind = (
-            "New wallet trade"
-            if signal.signal_type == "LARGE_NEW_WALLET_TRADE"
-            else "Trade"
-        )
-        side = payload.get("side")
-        outcome = payload.get("outcome")
-        notional = _format_usd(payload.get("notional_usd"))
-        price = _format_price(payload.get("price"))
-        title = payload.get("market_title") or payload.get("market_slug")
-        parts = [kind]
-        if side:
-            parts.append(str(side))
-        if outcome:
-            parts.append(str(outcome))
-        if notional:
-            parts.append(notional)
-        if price:
-            parts.append(f"@{price}")
-        summary = " ".join(parts)
-        if title:
-            return f"{prefix} {summary} — {title}"
-        return f"{prefix} {summary}"
-    return f"{prefix} {signal.signal_type}"
+    edge_label = f"{edge_pct:.2f}%" if edge_pct is not None else str(edge)
+    return f"[SEV{signal.severity}] Arb buy-both {edge_label} edge @ {q_max} shares"
+
+
+def _format_trade(kind: str, signal: SignalEvent) -> str:
+    payload = signal.payload
+    side = payload.get("side")
+    outcome = payload.get("outcome")
+    notional = _format_usd(payload.get("notional_usd"))
+    price = _format_price(payload.get("price"))
+    title = payload.get("market_title") or payload.get("market_slug")
+    parts = [kind]
+    if side:
+        parts.append(str(side))
+    if outcome:
+        parts.append(str(outcome))
+    if notional:
+        parts.append(notional)
+    if price:
+        parts.append(f"@{price}")
+    summary = " ".join(parts)
+    if title:
+        return f"[SEV{signal.severity}] {summary} — {title}"
+    return f"[SEV{signal.severity}] {summary}"
+
+
+def _format_default(signal: SignalEvent) -> str:
+    return f"[SEV{signal.severity}] {signal.signal_type}"
+
+
+_MESSAGE_FORMATTERS: dict[str, Callable[[SignalEvent], str]] = {
+    SignalType.ARB_BUY_BOTH: _format_arb,
+    SignalType.LARGE_TAKER_TRADE: partial(_format_trade, "Trade"),
+    SignalType.LARGE_NEW_WALLET_TRADE: partial(_format_trade, "New wallet trade"),
+}
 
 
 def _format_usd(value: Any) -> str | None:
@@ -312,22 +498,21 @@ def _format_price(value: Any) -> str | None:
 
 
 def _log_alert(
-    session: Session,
+    log_rows: list[dict[str, Any]],
     signal: SignalEvent,
     notification_key: str,
-    status: AlertStatus | str,
+    status: AlertStatus,
     error: str | None,
     channel: str | None = None,
 ) -> None:
-    if isinstance(status, str):
-        status = AlertStatus.SUPPRESSED
-    log = AlertLog(
-        signal_event_id=signal.id,
-        channel=channel or "dedupe",
-        notification_key=notification_key,
-        sent_at=utc_now(),
-        status=status,
-        severity=signal.severity,
-        error=error,
+    log_rows.append(
+        {
+            "signal_event_id": signal.id,
+            "channel": channel or "dedupe",
+            "notification_key": notification_key,
+            "sent_at": utc_now(),
+            "status": status,
+            "severity": signal.severity,
+            "error": error,
+        }
     )
-    session.add(log)
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import os
-from functools import lru_cache
+import time
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel, Field
 from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 
 from polymercado.models import AppConfig
@@ -66,6 +68,7 @@ class AppSettings(BaseModel):
     MIN_GAMMA_VOLUME: float = Field(default=50000, ge=0)
     MIN_GAMMA_LIQUIDITY: float = Field(default=10000, ge=0)
     MIN_OPEN_INTEREST: float = Field(default=5000, ge=0)
+    TRACKED_MARKETS_CACHE_SECONDS: float = Field(default=30, ge=0)
 
     MARKET_SCORE_W1: float = Field(default=1.0, ge=0)
     MARKET_SCORE_W2: float = Field(default=1.0, ge=0)
@@ -116,22 +119,52 @@ class AppSettings(BaseModel):
     DATA_QUALITY_TRADE_SAMPLE_LIMIT: int = Field(default=200, ge=1)
     DATA_QUALITY_MAX_NEW_WALLETS_PER_HOUR: int = Field(default=500, ge=0)
 
+    @cached_property
+    def market_score_weights(self) -> tuple[float, float, float, float]:
+        return (
+            self.MARKET_SCORE_W1,
+            self.MARKET_SCORE_W2,
+            self.MARKET_SCORE_W3,
+            self.MARKET_SCORE_W4,
+        )
+
     def config_snapshot(self, keys: list[str]) -> dict[str, Any]:
-        data = self.model_dump()
-        return {key: data[key] for key in keys if key in data}
+        fields = type(self).model_fields
+        return {key: getattr(self, key) for key in keys if key in fields}
+
+
+_SETTINGS_CACHE: dict[Engine | Connection | None, tuple[float, AppSettings]] = {}
+# Bounds how long environment changes and AppConfig writes made by other
+# processes go unnoticed; local config updates invalidate the cache directly.
+_SETTINGS_CACHE_TTL_SECONDS = 30.0
 
 
 def load_settings(session: Session | None = None) -> AppSettings:
+    cache_key = session.get_bind() if session is not None else None
+    now = time.monotonic()
+    entry = _SETTINGS_CACHE.get(cache_key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    settings = _load_settings_uncached(session)
+    _SETTINGS_CACHE[cache_key] = (now + _SETTINGS_CACHE_TTL_SECONDS, settings)
+    return settings
+
+
+def invalidate_settings_cache() -> None:
+    _SETTINGS_CACHE.clear()
+
+
+def _load_settings_uncached(session: Session | None) -> AppSettings:
     _load_dotenv()
-    data = AppSettings().model_dump()
+    fields = AppSettings.model_fields
+    overrides: dict[str, Any] = {}
 
     if session is not None:
-        rows = session.execute(select(AppConfig)).scalars().all()
-        for row in rows:
-            data[row.key] = row.value
+        rows = session.execute(select(AppConfig.key, AppConfig.value)).all()
+        overrides.update({key: value for key, value in rows if key in fields})
 
-    for key in list(data.keys()):
+    for key in fields:
         if key in os.environ:
-            data[key] = os.environ[key]
+            overrides[key] = os.environ[key]
 
-    return AppSettings.model_validate(data)
+    return AppSettings(**overrides)
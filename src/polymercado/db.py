@@ -1,51 +1,193 @@
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Iterator
+import math
+from typing import Any, Iterator
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session, sessionmaker
+import orjson
+from sqlalchemy import (
+    create_engine,
+    event,
+    exists,
+    func,
+    insert,
+    inspect,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, aliased, sessionmaker
 
 from polymercado.config import AppSettings
-from polymercado.models import Base
+from polymercado.models import Base, Market, SignalEvent
+
+
+def _sqlite_ln(value: float | None) -> float | None:
+    # Same contract as SQLite's built-in ln(): NULL outside the domain.
+    if value is None or value <= 0:
+        return None
+    return math.log(value)
 
 
 def _configure_sqlite(dbapi_connection, _connection_record) -> None:
+    # ln() is only built in when SQLite has SQLITE_ENABLE_MATH_FUNCTIONS;
+    # market ranking needs it on every build.
+    dbapi_connection.create_function("ln", 1, _sqlite_ln, deterministic=True)
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA journal_mode=WAL")
     cursor.execute("PRAGMA synchronous=NORMAL")
     cursor.execute("PRAGMA busy_timeout=30000")
     cursor.execute("PRAGMA temp_store=MEMORY")
     cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA wal_autocheckpoint=4000")
     cursor.close()
 
 
+def _json_serializer(value: Any) -> str:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 def create_engine_from_url(database_url: str) -> Engine:
     connect_args = {}
+    pool_args = {}
     if database_url.startswith("sqlite"):
         connect_args["check_same_thread"] = False
         connect_args["timeout"] = 30
-    engine = create_engine(database_url, connect_args=connect_args, future=True)
+    else:
+        pool_args = {
+            "pool_size": 20,
+            "max_overflow": 30,
+            "pool_pre_ping": True,
+            "pool_use_lifo": True,
+            "pool_recycle": 1800,
+        }
+    engine = create_engine(
+        database_url,
+        connect_args=connect_args,
+        future=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+        **pool_args,
+    )
     if database_url.startswith("sqlite"):
         event.listen(engine, "connect", _configure_sqlite)
     return engine
 
 
-@lru_cache
+def checkpoint_wal(engine: Engine) -> None:
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+_ENGINES: dict[str, Engine] = {}
+_SESSION_FACTORIES: dict[str, sessionmaker[Session]] = {}
+
+
 def get_engine(database_url: str) -> Engine:
-    return create_engine_from_url(database_url)
+    engine = _ENGINES.get(database_url)
+    if engine is None:
+        engine = _ENGINES[database_url] = create_engine_from_url(database_url)
+    return engine
 
 
 def init_db(settings: AppSettings) -> None:
     engine = get_engine(settings.DATABASE_URL)
     Base.metadata.create_all(engine)
+    _add_missing_market_columns(engine)
+    _create_missing_indexes(engine)
+    _backfill_signal_dedupe_keys(engine)
+
+
+def _add_missing_market_columns(engine: Engine) -> None:
+    # create_all does not alter existing tables; add columns introduced later.
+    existing = {column["name"] for column in inspect(engine).get_columns("markets")}
+    with engine.begin() as connection:
+        for column in Market.__table__.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            connection.exec_driver_sql(
+                f"ALTER TABLE markets ADD COLUMN {column.name} {column_type}"
+            )
+
+
+def _create_missing_indexes(engine: Engine) -> None:
+    # Likewise for indexes added to tables that already exist.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+_LEGACY_SIGNAL_PREFIX = "SignalType."
+
+
+def _backfill_signal_dedupe_keys(engine: Engine) -> None:
+    # Trade signals used to be keyed on the enum repr ("SignalType.X:...");
+    # they now use the bare value like the other signal types. The EXISTS
+    # probe keeps startup to a single read once no legacy keys are left.
+    legacy = SignalEvent.dedupe_key.startswith(_LEGACY_SIGNAL_PREFIX)
+    with engine.begin() as connection:
+        if not connection.scalar(select(exists().where(legacy))):
+            return
+        bare_key = func.substr(SignalEvent.dedupe_key, len(_LEGACY_SIGNAL_PREFIX) + 1)
+        # A legacy row whose bare key was already re-emitted is left as is
+        # rather than tripping the unique constraint.
+        existing = aliased(SignalEvent)
+        connection.execute(
+            update(SignalEvent)
+            .where(legacy, ~exists().where(existing.dedupe_key == bare_key))
+            .values(dedupe_key=bare_key)
+        )
+
+
+def bulk_insert(
+    session: Session, model: type[Base], rows: list[dict[str, Any]]
+) -> None:
+    # Rows must share their keys. Postgres (psycopg 3) takes them via COPY,
+    # which skips per-row statement parsing; other dialects use executemany.
+    if not rows:
+        return
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql" or bind.dialect.driver != "psycopg":
+        session.execute(insert(model), rows)
+        return
+    columns = list(rows[0])
+    statement = f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN"
+    cursor = session.connection().connection.cursor()
+    try:
+        with cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row([row[column] for column in columns])
+    finally:
+        cursor.close()
+
+
+_DIALECT_INSERTS: dict[Engine | Connection | None, Any] = {}
+
+
+def dialect_insert(session: Session):
+    # The dialect's own insert() (for ON CONFLICT clauses), resolved once per bind.
+    bind = session.bind
+    insert_fn = _DIALECT_INSERTS.get(bind)
+    if insert_fn is None:
+        if bind and bind.dialect.name == "sqlite":
+            insert_fn = sqlite_insert
+        else:
+            insert_fn = pg_insert
+        _DIALECT_INSERTS[bind] = insert_fn
+    return insert_fn
 
 
-@lru_cache
 def get_session_factory(database_url: str) -> sessionmaker[Session]:
-    engine = get_engine(database_url)
-    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    session_factory = _SESSION_FACTORIES.get(database_url)
+    if session_factory is None:
+        session_factory = _SESSION_FACTORIES[database_url] = sessionmaker(
+            bind=get_engine(database_url), autoflush=False, autocommit=False
+        )
+    return session_factory
 
 
 def get_session(settings: AppSettings) -> Iterator[Session]:
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import asyncio
 from typing import Any
 
 import httpx
+from sqlalchemy import select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from polymercado.config import AppSettings
+from polymercado.db import bulk_insert, dialect_insert
+from polymercado.ingestion.http import build_async_client, run_coroutine
 from polymercado.ingestion.universe import select_tracked_markets
 from polymercado.markets import resolve_binary_tokens
 from polymercado.models import Market, MarketMetricsTS, OrderbookLevels, OrderbookSide
@@ -29,59 +32,122 @@ def _extract_levels(
     return bids, asks
 
 
-def _dialect_insert(session: Session):
-    if session.bind and session.bind.dialect.name == "sqlite":
-        return sqlite_insert
-    return pg_insert
+def _orderbook_upsert(insert_fn):
+    insert_stmt = insert_fn(OrderbookLevels)
+    return insert_stmt.on_conflict_do_update(
+        index_elements=[OrderbookLevels.token_id, OrderbookLevels.side],
+        set_={
+            "condition_id": insert_stmt.excluded.condition_id,
+            "levels": insert_stmt.excluded.levels,
+            "tick_size": insert_stmt.excluded.tick_size,
+            "min_order_size": insert_stmt.excluded.min_order_size,
+            "neg_risk": insert_stmt.excluded.neg_risk,
+            "as_of": insert_stmt.excluded.as_of,
+            "hash": insert_stmt.excluded.hash,
+        },
+    )
 
 
-def fetch_books(client: httpx.Client, token_ids: list[str]) -> list[dict[str, Any]]:
+_ORDERBOOK_UPSERTS = {
+    sqlite_insert: _orderbook_upsert(sqlite_insert),
+    pg_insert: _orderbook_upsert(pg_insert),
+}
+
+
+async def fetch_books(
+    client: httpx.AsyncClient, token_ids: list[str]
+) -> list[dict[str, Any]]:
     if not token_ids:
         return []
     payload = [{"token_id": token_id} for token_id in token_ids]
-    response = client.post(f"{CLOB_BASE}/books", json=payload)
+    response = await client.post(f"{CLOB_BASE}/books", json=payload)
     response.raise_for_status()
     return response.json()
 
 
-def upsert_orderbook(session: Session, book: dict[str, Any]) -> None:
+async def _fetch_book_batches(
+    batches: list[list[str]], settings: AppSettings
+) -> list[list[dict[str, Any]]]:
+    async with build_async_client(settings) as client:
+        return await asyncio.gather(*(fetch_books(client, batch) for batch in batches))
+
+
+def _orderbook_rows(book: dict[str, Any]) -> list[dict[str, Any]]:
     condition_id = book.get("market")
     token_id = book.get("asset_id")
     if not condition_id or not token_id:
-        return
+        return []
 
     as_of = parse_datetime(book.get("timestamp"))
     bids, asks = _extract_levels(book)
+    rows: list[dict[str, Any]] = []
     for side, levels in (
         (OrderbookSide.BID, bids),
         (OrderbookSide.ASK, asks),
     ):
         if levels is None:
             continue
-        insert_stmt = _dialect_insert(session)(OrderbookLevels).values(
-            token_id=token_id,
-            side=side,
-            condition_id=condition_id,
-            levels=levels,
-            tick_size=book.get("tick_size"),
-            min_order_size=book.get("min_order_size"),
-            neg_risk=book.get("neg_risk"),
-            as_of=as_of,
-            hash=book.get("hash"),
-        )
-        stmt = insert_stmt.on_conflict_do_update(
-            index_elements=[OrderbookLevels.token_id, OrderbookLevels.side],
-            set_={
-                "condition_id": insert_stmt.excluded.condition_id,
-                "levels": insert_stmt.excluded.levels,
-                "tick_size": insert_stmt.excluded.tick_size,
-                "min_order_size": insert_stmt.excluded.min_order_size,
-                "neg_risk": insert_stmt.excluded.neg_risk,
-                "as_of": insert_stmt.excluded.as_of,
-                "hash": insert_stmt.excluded.hash,
-            },
+        rows.append(
+            {
+                "token_id": token_id,
+                "side": side,
+                "condition_id": condition_id,
+                "levels": levels,
+                "tick_size": book.get("tick_size"),
+                "min_order_size": book.get("min_order_size"),
+                "neg_risk": book.get("neg_risk"),
+                "as_of": as_of,
+                "hash": book.get("hash"),
+            }
         )
-        session.execute(stmt)
+    return rows
+
+
+def upsert_orderbook(session: Session, book: dict[str, Any]) -> None:
+    upsert_orderbooks(session, [book])
+
+
+def upsert_orderbooks(
+    session: Session,
+    books: list[dict[str, Any]],
+    stored_hashes: dict[tuple[str, OrderbookSide], str] | None = None,
+) -> None:
+    rows_by_key: dict[tuple[str, OrderbookSide], dict[str, Any]] = {}
+    for book in books:
+        for row in _orderbook_rows(book):
+            rows_by_key[(row["token_id"], row["side"])] = row
+    if not rows_by_key:
+        return
+
+    rows: list[dict[str, Any]] = []
+    unchanged: list[dict[str, Any]] = []
+    for key, row in rows_by_key.items():
+        if stored_hashes is not None and row["hash"]:
+            if stored_hashes.get(key) == row["hash"]:
+                unchanged.append(
+                    {"token_id": key[0], "side": key[1], "as_of": row["as_of"]}
+                )
+                continue
+            stored_hashes[key] = row["hash"]
+        elif stored_hashes is not None:
+            stored_hashes.pop(key, None)
+        rows.append(row)
+
+    if rows:
+        session.execute(_ORDERBOOK_UPSERTS[dialect_insert(session)], rows)
+    if unchanged:
+        session.execute(update(OrderbookLevels), unchanged)
+
+
+def _stored_hashes(
+    session: Session, token_ids: list[str]
+) -> dict[tuple[str, OrderbookSide], str]:
+    rows = session.execute(
+        select(
+            OrderbookLevels.token_id, OrderbookLevels.side, OrderbookLevels.hash
+        ).where(OrderbookLevels.token_id.in_(token_ids))
+    ).all()
+    return {(token_id, side): hash_ for token_id, side, hash_ in rows if hash_}
 
 
 def sync_orderbooks(session: Session, settings: AppSettings) -> int:
@@ -101,60 +167,69 @@ def sync_orderbooks(session: Session, settings: AppSettings) -> int:
             token_ids, market.outcomes
         )
 
-    client = httpx.Client(timeout=settings.HTTP_TIMEOUT_SECONDS)
+    batches = [all_tokens[i : i + 500] for i in range(0, len(all_tokens), 500)]
+    stored_hashes = _stored_hashes(session, all_tokens)
     processed = 0
-    try:
-        for i in range(0, len(all_tokens), 500):
-            batch = all_tokens[i : i + 500]
-            books = fetch_books(client, batch)
-            for book in books:
-                upsert_orderbook(session, book)
-                processed += 1
-
-            _emit_metric_snapshot(session, books, token_map)
-    finally:
-        client.close()
+    best_prices: dict[str, tuple[float | None, float | None]] = {}
+    for books in run_coroutine(_fetch_book_batches(batches, settings)):
+        upsert_orderbooks(session, books, stored_hashes)
+        processed += len(books)
+        _collect_best_prices(books, best_prices)
 
+    _emit_metric_snapshot(session, best_prices, token_map)
     session.commit()
     return processed
 
 
-def _emit_metric_snapshot(
-    session: Session,
+def _collect_best_prices(
     books: list[dict[str, Any]],
-    token_map: dict[str, tuple[str | None, str | None]],
+    best_prices: dict[str, tuple[float | None, float | None]],
 ) -> None:
-    if not books:
-        return
-
-    best_prices: dict[str, dict[str, float | None]] = defaultdict(dict)
     for book in books:
         condition_id = book.get("market")
         token_id = book.get("asset_id")
         if not condition_id or not token_id:
             continue
         bids, asks = _extract_levels(book)
-        bids = bids or []
-        asks = asks or []
         best_bid = float(bids[0]["price"]) if bids else None
         best_ask = float(asks[0]["price"]) if asks else None
-        best_prices[token_id] = {"bid": best_bid, "ask": best_ask}
+        best_prices[token_id] = (best_bid, best_ask)
+
+
+def _emit_metric_snapshot(
+    session: Session,
+    best_prices: dict[str, tuple[float | None, float | None]],
+    token_map: dict[str, tuple[str | None, str | None]],
+) -> None:
+    if not best_prices:
+        return
 
+    now = utc_now()
+    rows: list[dict[str, Any]] = []
     for condition_id, (yes_token, no_token) in token_map.items():
         if not yes_token or not no_token:
             continue
-        yes_prices = best_prices.get(yes_token, {})
-        no_prices = best_prices.get(no_token, {})
-        snapshot = MarketMetricsTS(
-            condition_id=condition_id,
-            ts=utc_now(),
-            best_bid_yes=yes_prices.get("bid"),
-            best_ask_yes=yes_prices.get("ask"),
-            best_bid_no=no_prices.get("bid"),
-            best_ask_no=no_prices.get("ask"),
+        best_bid_yes, best_ask_yes = best_prices.get(yes_token, (None, None))
+        best_bid_no, best_ask_no = best_prices.get(no_token, (None, None))
+        rows.append(
+            {
+                "condition_id": condition_id,
+                "ts": now,
+                "best_bid_yes": best_bid_yes,
+                "best_ask_yes": best_ask_yes,
+                "best_bid_no": best_bid_no,
+                "best_ask_no": best_ask_no,
+                "spread_yes": (
+                    best_ask_yes - best_bid_yes
+                    if best_bid_yes is not None and best_ask_yes is not None
+                    else None
+                ),
+                "spread_no": (
+                    best_ask_no - best_bid_no
+                    if best_bid_no is not None and best_ask_no is not None
+                    else None
+                ),
+            }
         )
-        if snapshot.best_bid_yes is not None and snapshot.best_ask_yes is not None:
-            snapshot.spread_yes = snapshot.best_ask_yes - snapshot.best_bid_yes
-        if snapshot.best_bid_no is not None and snapshot.best_ask_no is not None:
-            snapshot.spread_no = snapshot.best_ask_no - snapshot.best_bid_no
-        session.add(snapshot)
+    if rows:
+        bulk_insert(session, MarketMetricsTS, rows)
@@ -1,24 +1,36 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import math
 import threading
+from array import array
+from bisect import bisect_left
 from contextlib import suppress
-from decimal import Decimal
+from dataclasses import dataclass
 from typing import Any
 
+import orjson
 import websockets
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from polymercado.config import AppSettings
-from polymercado.ingestion.clob import upsert_orderbook
+from polymercado.ingestion.clob import upsert_orderbooks
 from polymercado.ingestion.universe import select_tracked_markets
 from polymercado.logging import get_logger
-from polymercado.models import Market
-from polymercado.utils import to_decimal, utc_now
+from polymercado.models import Market, OrderbookSide
+from polymercado.utils import utc_now
 
 logger = get_logger(__name__)
 
+FLUSH_INTERVAL_SECONDS = 0.1
+MAX_FLUSH_BACKOFF_SECONDS = 5.0
+
+
+@dataclass(slots=True)
+class BookSide:
+    prices: array[float]
+    levels: list[dict[str, Any]]
+
 
 class OrderbookWebsocket:
     def __init__(self, settings: AppSettings, session_factory: sessionmaker):
@@ -27,6 +39,11 @@ class OrderbookWebsocket:
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
         self._book_cache: dict[str, dict[str, Any]] = {}
+        self._book_sides: dict[tuple[str, str], BookSide] = {}
+        self._session: Session | None = None
+        self._dirty: set[str] = set()
+        self._token_market: dict[str, str] = {}
+        self._stored_hashes: dict[tuple[str, OrderbookSide], str] = {}
 
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -43,7 +60,8 @@ class OrderbookWebsocket:
         asyncio.run(self._run_loop())
 
     async def _run_loop(self) -> None:
-        token_ids = self._load_tokens()
+        self._token_market = self._load_tokens()
+        token_ids = list(self._token_market)
         if not token_ids:
             return
 
@@ -79,26 +97,22 @@ class OrderbookWebsocket:
                     urls.append(url)
         return urls
 
-    def _load_tokens(self) -> list[str]:
+    def _load_tokens(self) -> dict[str, str]:
         session = self.session_factory()
         try:
             condition_ids = select_tracked_markets(session, self.settings)
             if not condition_ids:
-                return []
+                return {}
             markets = (
                 session.query(Market)
                 .filter(Market.condition_id.in_(condition_ids))
                 .all()
             )
-            tokens: list[str] = []
-            seen: set[str] = set()
+            token_market: dict[str, str] = {}
             for market in markets:
                 for token_id in market.token_ids or []:
-                    if token_id in seen:
-                        continue
-                    seen.add(token_id)
-                    tokens.append(token_id)
-            return tokens
+                    token_market.setdefault(token_id, market.condition_id)
+            return token_market
         finally:
             session.close()
 
@@ -112,17 +126,17 @@ class OrderbookWebsocket:
             refresh_task = asyncio.create_task(
                 self._refresh_loop(socket, current_tokens)
             )
+            self._session = self.session_factory()
+            flush_task = asyncio.create_task(self._flush_loop())
             try:
                 while not self._stop_event.is_set():
                     try:
                         message = await asyncio.wait_for(socket.recv(), timeout=1.0)
                     except asyncio.TimeoutError:
                         continue
-                    if isinstance(message, bytes):
-                        message = message.decode("utf-8", errors="ignore")
                     try:
-                        data = json.loads(message)
-                    except json.JSONDecodeError:
+                        data = orjson.loads(message)
+                    except orjson.JSONDecodeError:
                         continue
                     if not isinstance(data, dict):
                         continue
@@ -135,12 +149,16 @@ class OrderbookWebsocket:
             finally:
                 ping_task.cancel()
                 refresh_task.cancel()
+                flush_task.cancel()
                 with suppress(asyncio.CancelledError):
                     await ping_task
                 with suppress(asyncio.CancelledError):
                     await refresh_task
+                with suppress(asyncio.CancelledError, Exception):
+                    await flush_task
                 with suppress(Exception):
                     await socket.close()
+                self._close_session()
 
     async def _subscribe(
         self, socket: websockets.WebSocketClientProtocol, token_ids: list[str]
@@ -148,7 +166,9 @@ class OrderbookWebsocket:
         chunks = self._chunk_tokens(token_ids)
         if not chunks:
             return
-        await socket.send(json.dumps({"assets_ids": chunks[0], "type": "market"}))
+        await socket.send(
+            orjson.dumps({"assets_ids": chunks[0], "type": "market"}).decode()
+        )
         for chunk in chunks[1:]:
             await self._send_subscribe(socket, chunk)
 
@@ -157,7 +177,7 @@ class OrderbookWebsocket:
     ) -> None:
         for chunk in self._chunk_tokens(token_ids):
             await socket.send(
-                json.dumps({"assets_ids": chunk, "operation": "subscribe"})
+                orjson.dumps({"assets_ids": chunk, "operation": "subscribe"}).decode()
             )
 
     async def _send_unsubscribe(
@@ -165,7 +185,7 @@ class OrderbookWebsocket:
     ) -> None:
         for chunk in self._chunk_tokens(token_ids):
             await socket.send(
-                json.dumps({"assets_ids": chunk, "operation": "unsubscribe"})
+                orjson.dumps({"assets_ids": chunk, "operation": "unsubscribe"}).decode()
             )
 
     async def _refresh_loop(
@@ -176,7 +196,8 @@ class OrderbookWebsocket:
         interval = max(self.settings.SYNC_UNIVERSE_INTERVAL_SECONDS, 1)
         while not self._stop_event.is_set():
             await asyncio.sleep(interval)
-            latest = set(self._load_tokens())
+            self._token_market = self._load_tokens()
+            latest = set(self._token_market)
             to_add = sorted(latest - current_tokens)
             to_remove = sorted(current_tokens - latest)
             if to_add:
@@ -185,9 +206,28 @@ class OrderbookWebsocket:
                 await self._send_unsubscribe(socket, to_remove)
                 for token_id in to_remove:
                     self._book_cache.pop(token_id, None)
+                    self._drop_book_sides(token_id)
             current_tokens.clear()
             current_tokens.update(latest)
 
+    async def _flush_loop(self) -> None:
+        delay = FLUSH_INTERVAL_SECONDS
+        while not self._stop_event.is_set():
+            await asyncio.sleep(delay)
+            try:
+                self._flush_books()
+            except Exception:
+                # Drop the failed batch (books are re-marked on their next
+                # update) and back off so a persistent failure does not spin.
+                logger.exception("websocket book flush failed")
+                self._dirty.clear()
+                self._stored_hashes.clear()
+                if self._session is not None:
+                    self._session.rollback()
+                delay = min(delay * 2, MAX_FLUSH_BACKOFF_SECONDS)
+            else:
+                delay = FLUSH_INTERVAL_SECONDS
+
     async def _ping_loop(self, socket: websockets.WebSocketClientProtocol) -> None:
         while not self._stop_event.is_set():
             await asyncio.sleep(self.settings.CLOB_WS_PING_SECONDS)
@@ -205,16 +245,17 @@ class OrderbookWebsocket:
         token_id = book.get("asset_id")
         if not token_id:
             return
-        if not book.get("timestamp"):
-            book["timestamp"] = utc_now().isoformat()
+        if not book.get("market"):
+            book["market"] = self._token_market.get(token_id)
         self._book_cache[token_id] = book
-        self._persist_book(book)
+        self._drop_book_sides(token_id)
+        self._mark_dirty(book)
 
     def _handle_price_change(self, data: dict[str, Any]) -> None:
         changes = data.get("price_changes") or []
         if not isinstance(changes, list):
             return
-        timestamp = data.get("timestamp") or utc_now().isoformat()
+        timestamp = data.get("timestamp")
         market = data.get("market")
 
         grouped: dict[str, list[dict[str, Any]]] = {}
@@ -230,12 +271,18 @@ class OrderbookWebsocket:
             book = self._book_cache.get(asset_id)
             if not book:
                 continue
+            touched: set[str] = set()
             for change in asset_changes:
-                self._apply_price_change(book, change)
-            if market and not book.get("market"):
-                book["market"] = market
+                key = self._apply_price_change(asset_id, book, change)
+                if key:
+                    touched.add(key)
+            for key in touched:
+                book[key] = self._side_levels(self._book_sides[(asset_id, key)], key)
+            if not book.get("market"):
+                book["market"] = market or self._token_market.get(asset_id)
+            book["hash"] = asset_changes[-1].get("hash")
             book["timestamp"] = timestamp
-            self._persist_book(book)
+            self._mark_dirty(book)
 
     def _normalize_book(self, data: dict[str, Any]) -> dict[str, Any]:
         book = dict(data)
@@ -245,64 +292,105 @@ class OrderbookWebsocket:
             book["asks"] = book.get("sells")
         return book
 
-    def _apply_price_change(self, book: dict[str, Any], change: dict[str, Any]) -> None:
+    def _apply_price_change(
+        self, asset_id: str, book: dict[str, Any], change: dict[str, Any]
+    ) -> str | None:
         side = str(change.get("side", "")).upper()
         if side == "BUY":
             key = "bids"
         elif side == "SELL":
             key = "asks"
         else:
-            return
-
-        levels = book.get(key) or []
-        updated = self._update_levels(
-            levels, change.get("price"), change.get("size"), side
-        )
-        book[key] = updated
-
-    def _update_levels(
-        self,
-        levels: list[dict[str, Any]],
-        price: Any,
-        size: Any,
-        side: str,
-    ) -> list[dict[str, Any]]:
-        price_dec = to_decimal(price)
-        size_dec = to_decimal(size)
-        if price_dec is None or size_dec is None:
-            return list(levels)
-
-        updated: list[dict[str, Any]] = []
-        found = False
-        for level in levels:
-            level_price = (
-                to_decimal(level.get("price")) if isinstance(level, dict) else None
-            )
-            if level_price is None:
-                continue
-            if level_price == price_dec:
-                found = True
-                if size_dec > 0:
-                    updated.append({"price": str(price_dec), "size": str(size_dec)})
+            return None
+
+        price = _to_float(change.get("price"))
+        size = _to_float(change.get("size"))
+        if price is None or size is None:
+            return None
+
+        book_side = self._book_side(asset_id, book, key)
+        prices = book_side.prices
+        idx = bisect_left(prices, price)
+        found = idx < len(prices) and prices[idx] == price
+        if size > 0:
+            level = {"price": str(change.get("price")), "size": str(change.get("size"))}
+            if found:
+                book_side.levels[idx] = level
             else:
-                updated.append(level)
+                prices.insert(idx, price)
+                book_side.levels.insert(idx, level)
+        elif found:
+            del prices[idx]
+            del book_side.levels[idx]
+        return key
+
+    def _book_side(self, asset_id: str, book: dict[str, Any], key: str) -> BookSide:
+        book_side = self._book_sides.get((asset_id, key))
+        if book_side is None:
+            by_price: dict[float, dict[str, Any]] = {}
+            for level in book.get(key) or []:
+                if not isinstance(level, dict):
+                    continue
+                price = _to_float(level.get("price"))
+                if price is None:
+                    continue
+                by_price[price] = level
+            prices = sorted(by_price)
+            book_side = BookSide(
+                prices=array("d", prices),
+                levels=[by_price[price] for price in prices],
+            )
+            self._book_sides[(asset_id, key)] = book_side
+        return book_side
 
-        if not found and size_dec > 0:
-            updated.append({"price": str(price_dec), "size": str(size_dec)})
+    def _side_levels(self, book_side: BookSide, key: str) -> list[dict[str, Any]]:
+        if key == "bids":
+            return book_side.levels[::-1]
+        return list(book_side.levels)
 
-        reverse = side == "BUY"
-        updated.sort(
-            key=lambda item: to_decimal(item.get("price")) or Decimal("0"),
-            reverse=reverse,
-        )
-        return updated
+    def _drop_book_sides(self, asset_id: str) -> None:
+        self._book_sides.pop((asset_id, "bids"), None)
+        self._book_sides.pop((asset_id, "asks"), None)
 
-    def _persist_book(self, book: dict[str, Any]) -> None:
+    def _mark_dirty(self, book: dict[str, Any]) -> None:
         if not book.get("asset_id") or not book.get("market"):
             return
-        session = self.session_factory()
+        self._dirty.add(book["asset_id"])
+
+    def _flush_books(self) -> None:
+        if self._session is None or not self._dirty:
+            return
+        books = [
+            self._book_cache[asset_id]
+            for asset_id in self._dirty
+            if asset_id in self._book_cache
+        ]
+        now = None
+        for book in books:
+            if not book.get("timestamp"):
+                now = now or utc_now().isoformat()
+                book["timestamp"] = now
+        upsert_orderbooks(self._session, books, self._stored_hashes)
+        self._session.commit()
+        self._dirty.clear()
+
+    def _close_session(self) -> None:
+        if self._session is None:
+            return
         try:
-            upsert_orderbook(session, book)
-            session.commit()
+            self._flush_books()
         finally:
-            session.close()
+            self._session.close()
+            self._session = None
+
+
+def _to_float(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return number
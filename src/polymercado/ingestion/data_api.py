@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
-import httpx
-from sqlalchemy import delete, func, select
+from sqlalchemy import bindparam, delete, func, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from polymercado.config import AppSettings
-from polymercado.ingestion.http import fetch_json
+from polymercado.db import bulk_insert, dialect_insert
+from polymercado.ingestion.http import (
+    build_async_client,
+    fetch_json_async,
+    run_coroutine,
+)
 from polymercado.ingestion.universe import select_tracked_markets
 from polymercado.models import (
     Market,
@@ -35,37 +40,98 @@ from polymercado.utils import ensure_utc, to_decimal, utc_now
 from polymercado.utils import safe_lower
 
 DATA_BASE = "https://data-api.polymarket.com"
-
-
-def _dialect_insert(session: Session):
-    if session.bind and session.bind.dialect.name == "sqlite":
-        return sqlite_insert
-    return pg_insert
+_ZERO = Decimal("0")
+_SIGNAL_PREFIXES = {signal_type: f"{signal_type.value}:" for signal_type in SignalType}
 
 
 def _latest_trade_ts(session: Session) -> datetime | None:
     return session.execute(select(func.max(Trade.trade_ts))).scalar_one_or_none()
 
 
-def _latest_market_metrics(
-    session: Session, condition_id: str
-) -> dict[str, Any] | None:
-    row = (
-        session.execute(
-            select(MarketMetricsTS)
-            .where(MarketMetricsTS.condition_id == condition_id)
-            .order_by(MarketMetricsTS.ts.desc())
-            .limit(1)
+def _exposure_upsert(insert_fn):
+    insert_stmt = insert_fn(WalletMarketExposure)
+    return insert_stmt.on_conflict_do_update(
+        index_elements=[
+            WalletMarketExposure.wallet,
+            WalletMarketExposure.condition_id,
+        ],
+        set_={
+            "net_shares": insert_stmt.excluded.net_shares,
+            "avg_entry_price": insert_stmt.excluded.avg_entry_price,
+            "last_updated_at": insert_stmt.excluded.last_updated_at,
+        },
+    )
+
+
+_EXPOSURE_UPSERTS = {
+    sqlite_insert: _exposure_upsert(sqlite_insert),
+    pg_insert: _exposure_upsert(pg_insert),
+}
+
+
+def _trade_insert(insert_fn):
+    return (
+        insert_fn(Trade)
+        .on_conflict_do_nothing(index_elements=[Trade.trade_pk])
+        .returning(Trade.trade_pk)
+    )
+
+
+def _signal_insert(insert_fn):
+    return insert_fn(SignalEvent).on_conflict_do_nothing(
+        index_elements=[SignalEvent.dedupe_key]
+    )
+
+
+_TRADE_INSERTS = {
+    sqlite_insert: _trade_insert(sqlite_insert),
+    pg_insert: _trade_insert(pg_insert),
+}
+_SIGNAL_INSERTS = {
+    sqlite_insert: _signal_insert(sqlite_insert),
+    pg_insert: _signal_insert(pg_insert),
+}
+_RANKED_METRICS = (
+    select(
+        MarketMetricsTS.condition_id,
+        MarketMetricsTS.gamma_liquidity,
+        MarketMetricsTS.gamma_volume,
+        MarketMetricsTS.open_interest,
+        func.row_number()
+        .over(
+            partition_by=MarketMetricsTS.condition_id,
+            order_by=MarketMetricsTS.ts.desc(),
         )
-        .scalars()
-        .first()
+        .label("rank"),
     )
-    if not row:
-        return None
+    .where(MarketMetricsTS.condition_id.in_(bindparam("condition_ids", expanding=True)))
+    .subquery()
+)
+_LATEST_METRICS_STMT = select(
+    _RANKED_METRICS.c.condition_id,
+    _RANKED_METRICS.c.gamma_liquidity,
+    _RANKED_METRICS.c.gamma_volume,
+    _RANKED_METRICS.c.open_interest,
+).where(_RANKED_METRICS.c.rank == 1)
+
+
+def _latest_market_metrics(
+    session: Session, condition_ids: set[str]
+) -> dict[str, dict[str, Any]]:
+    if not condition_ids:
+        return {}
+    rows = session.execute(_LATEST_METRICS_STMT, {"condition_ids": list(condition_ids)})
     return {
-        "market_liquidity": float(row.gamma_liquidity) if row.gamma_liquidity else None,
-        "market_volume": float(row.gamma_volume) if row.gamma_volume else None,
-        "market_open_interest": float(row.open_interest) if row.open_interest else None,
+        row.condition_id: {
+            "market_liquidity": float(row.gamma_liquidity)
+            if row.gamma_liquidity
+            else None,
+            "market_volume": float(row.gamma_volume) if row.gamma_volume else None,
+            "market_open_interest": float(row.open_interest)
+            if row.open_interest
+            else None,
+        }
+        for row in rows
     }
 
 
@@ -119,34 +185,44 @@ def _market_tags_context(
     return context, market.title, market.slug
 
 
+async def _fetch_all(
+    settings: AppSettings, url: str, params_list: list[dict[str, Any]]
+) -> list[Any]:
+    semaphore = asyncio.Semaphore(settings.HTTP_MAX_CONCURRENCY)
+    async with build_async_client(settings) as client:
+
+        async def fetch(params: dict[str, Any]) -> Any:
+            async with semaphore:
+                return await fetch_json_async(client, url, params=params)
+
+        return await asyncio.gather(*(fetch(params) for params in params_list))
+
+
 def sync_open_interest(session: Session, settings: AppSettings) -> int:
     condition_ids = select_tracked_markets(session, settings)
     if not condition_ids:
         return 0
 
-    client = httpx.Client(timeout=settings.HTTP_TIMEOUT_SECONDS)
-    processed = 0
-    try:
-        for i in range(0, len(condition_ids), 50):
-            batch = condition_ids[i : i + 50]
-            params = {"market": batch}
-            data = fetch_json(client, f"{DATA_BASE}/oi", params=params)
-            for item in data:
-                condition_id = item.get("market")
-                if not condition_id:
-                    continue
-                snapshot = MarketMetricsTS(
-                    condition_id=condition_id,
-                    ts=utc_now(),
-                    open_interest=item.get("value"),
-                )
-                session.add(snapshot)
-                processed += 1
-    finally:
-        client.close()
+    params_list = [
+        {"market": condition_ids[i : i + 50]} for i in range(0, len(condition_ids), 50)
+    ]
+    results = run_coroutine(_fetch_all(settings, f"{DATA_BASE}/oi", params_list))
+    now = utc_now()
+    snapshots = [
+        {
+            "condition_id": item["market"],
+            "ts": now,
+            "open_interest": item.get("value"),
+        }
+        for data in results
+        for item in data
+        if item.get("market")
+    ]
+    if snapshots:
+        bulk_insert(session, MarketMetricsTS, snapshots)
 
     session.commit()
-    return processed
+    return len(snapshots)
 
 
 def sync_wallet_positions(session: Session, settings: AppSettings) -> int:
@@ -166,230 +242,296 @@ def sync_wallet_positions(session: Session, settings: AppSettings) -> int:
     if not wallets:
         return 0
 
-    client = httpx.Client(timeout=settings.HTTP_TIMEOUT_SECONDS)
+    params_list = [
+        {
+            "user": wallet.wallet,
+            "limit": settings.POSITIONS_PAGE_LIMIT,
+            "offset": 0,
+            "sizeThreshold": settings.POSITIONS_SIZE_THRESHOLD,
+        }
+        for wallet in wallets
+    ]
+    results = run_coroutine(_fetch_all(settings, f"{DATA_BASE}/positions", params_list))
+    now = utc_now()
+    rows: list[dict[str, Any]] = []
     processed = 0
-    try:
-        for wallet in wallets:
-            params = {
-                "user": wallet.wallet,
-                "limit": settings.POSITIONS_PAGE_LIMIT,
-                "offset": 0,
-                "sizeThreshold": settings.POSITIONS_SIZE_THRESHOLD,
-            }
-            positions = fetch_json(client, f"{DATA_BASE}/positions", params=params)
-            _upsert_wallet_positions(session, wallet.wallet, positions)
-            processed += len(positions)
-    finally:
-        client.close()
+    for wallet, positions in zip(wallets, results):
+        rows.extend(_exposure_rows(wallet.wallet, positions, now))
+        processed += len(positions)
+
+    if rows:
+        session.execute(_EXPOSURE_UPSERTS[dialect_insert(session)], rows)
+    # Every exposure still held was just stamped with `now`; anything else
+    # belonging to these wallets has been closed out.
+    session.execute(
+        delete(WalletMarketExposure).where(
+            WalletMarketExposure.wallet.in_([wallet.wallet for wallet in wallets]),
+            WalletMarketExposure.last_updated_at != now,
+        )
+    )
 
     session.commit()
     return processed
 
 
-def _upsert_wallet_positions(
-    session: Session, wallet: str, positions: list[dict[str, Any]]
-) -> None:
-    aggregates: dict[str, dict[str, Decimal]] = {}
+def _exposure_rows(
+    wallet: str, positions: list[dict[str, Any]], now: datetime
+) -> list[dict[str, Any]]:
+    # condition_id -> [net shares, cost, total shares]
+    aggregates: dict[str, list[Decimal]] = {}
     for position in positions:
         condition_id = position.get("conditionId")
         size = to_decimal(position.get("size"))
         if not condition_id or size is None:
             continue
         avg_price = to_decimal(position.get("avgPrice"))
-        outcome = safe_lower(position.get("outcome"))
-        sign = Decimal("-1") if outcome == "no" else Decimal("1")
+        abs_size = abs(size)
 
-        bucket = aggregates.setdefault(
-            condition_id,
-            {
-                "net": Decimal("0"),
-                "cost": Decimal("0"),
-                "total": Decimal("0"),
-            },
-        )
-        bucket["net"] += size * sign
+        bucket = aggregates.get(condition_id)
+        if bucket is None:
+            bucket = aggregates[condition_id] = [_ZERO, _ZERO, _ZERO]
+        if safe_lower(position.get("outcome")) == "no":
+            bucket[0] -= size
+        else:
+            bucket[0] += size
         if avg_price is not None:
-            bucket["cost"] += abs(size) * avg_price
-        bucket["total"] += abs(size)
+            bucket[1] += abs_size * avg_price
+        bucket[2] += abs_size
 
-    now = utc_now()
-    active_conditions = set(aggregates.keys())
-    if active_conditions:
-        session.execute(
-            delete(WalletMarketExposure).where(
-                WalletMarketExposure.wallet == wallet,
-                ~WalletMarketExposure.condition_id.in_(active_conditions),
-            )
-        )
-    else:
-        session.execute(
-            delete(WalletMarketExposure).where(WalletMarketExposure.wallet == wallet)
-        )
-
-    for condition_id, bucket in aggregates.items():
-        total = bucket["total"]
-        avg_entry = bucket["cost"] / total if total > 0 else None
-        insert_stmt = _dialect_insert(session)(WalletMarketExposure).values(
-            wallet=wallet,
-            condition_id=condition_id,
-            net_shares=bucket["net"],
-            avg_entry_price=avg_entry,
-            last_updated_at=now,
-        )
-        stmt = insert_stmt.on_conflict_do_update(
-            index_elements=[
-                WalletMarketExposure.wallet,
-                WalletMarketExposure.condition_id,
-            ],
-            set_={
-                "net_shares": insert_stmt.excluded.net_shares,
-                "avg_entry_price": insert_stmt.excluded.avg_entry_price,
-                "last_updated_at": insert_stmt.excluded.last_updated_at,
-            },
-        )
-        session.execute(stmt)
+    return [
+        {
+            "wallet": wallet,
+            "condition_id": condition_id,
+            "net_shares": net,
+            "avg_entry_price": cost / total if total > 0 else None,
+            "last_updated_at": now,
+        }
+        for condition_id, (net, cost, total) in aggregates.items()
+    ]
 
 
 def sync_large_trades(session: Session, settings: AppSettings) -> int:
-    client = httpx.Client(timeout=settings.HTTP_TIMEOUT_SECONDS)
-    processed = 0
+    return run_coroutine(_sync_large_trades(session, settings))
+
+
+async def _sync_large_trades(session: Session, settings: AppSettings) -> int:
     inserted = 0
 
     wallet_cache: dict[str, Wallet] = {}
     market_cache: dict[str, Market] = {}
     tag_index = _load_tag_index(session)
 
-    try:
-        last_trade_ts = ensure_utc(_latest_trade_ts(session))
-        stop_ts = None
-        if last_trade_ts:
-            stop_ts = last_trade_ts - timedelta(
-                seconds=settings.TRADE_SAFETY_WINDOW_SECONDS
-            )
-        else:
-            stop_ts = utc_now() - timedelta(
-                hours=settings.TRADES_INITIAL_LOOKBACK_HOURS
-            )
-        stop_ts = ensure_utc(stop_ts)
+    last_trade_ts = ensure_utc(_latest_trade_ts(session))
+    stop_ts = None
+    if last_trade_ts:
+        stop_ts = last_trade_ts - timedelta(
+            seconds=settings.TRADE_SAFETY_WINDOW_SECONDS
+        )
+    else:
+        stop_ts = utc_now() - timedelta(hours=settings.TRADES_INITIAL_LOOKBACK_HOURS)
+    stop_ts = ensure_utc(stop_ts)
 
+    page_limit = settings.TRADES_PAGE_LIMIT
+    async with build_async_client(settings) as client:
         offset = 0
         pages = 0
-        while True:
-            if pages >= settings.TRADES_MAX_PAGES:
-                break
-            params = {
-                "limit": settings.TRADES_PAGE_LIMIT,
-                "offset": offset,
-                "takerOnly": str(settings.TAKER_ONLY).lower(),
-                "filterType": "CASH",
-                "filterAmount": settings.LARGE_TRADE_USD_THRESHOLD,
-            }
-            trades = fetch_json(client, f"{DATA_BASE}/trades", params=params)
-            if not trades:
-                break
-
-            stop_reached = False
-            for trade in trades:
-                trade_ts = parse_trade_ts(trade.get("timestamp"))
-                if trade_ts is None:
-                    continue
-                trade_ts = ensure_utc(trade_ts)
-                if stop_ts and trade_ts < stop_ts:
-                    stop_reached = True
+        window = 1
+        done = False
+        while not done and pages < settings.TRADES_MAX_PAGES:
+            count = min(window, settings.TRADES_MAX_PAGES - pages)
+            fetched = await asyncio.gather(
+                *(
+                    fetch_json_async(
+                        client,
+                        f"{DATA_BASE}/trades",
+                        params=_trades_params(settings, offset + i * page_limit),
+                    )
+                    for i in range(count)
+                )
+            )
+            for trades in fetched:
+                if not trades:
+                    done = True
                     break
 
-                dedupe = trade_dedupe_key(trade)
-                price = to_decimal(trade.get("price"))
-                size = to_decimal(trade.get("size"))
-                notional = compute_notional(price, size)
-                if notional is None:
-                    continue
-
-                side = trade.get("side")
-                if side not in (TradeSide.BUY.value, TradeSide.SELL.value):
-                    continue
-                if not trade.get("conditionId") or not trade.get("asset"):
-                    continue
-
-                trade_row = {
-                    "trade_pk": dedupe,
-                    "transaction_hash": trade.get("transactionHash"),
-                    "wallet": trade.get("proxyWallet"),
-                    "condition_id": trade.get("conditionId"),
-                    "token_id": trade.get("asset"),
-                    "side": TradeSide(side),
-                    "price": price,
-                    "size": size,
-                    "notional_usd": notional,
-                    "trade_ts": trade_ts,
-                    "raw": trade,
-                }
-
-                insert_stmt = _dialect_insert(session)(Trade).values(**trade_row)
-                stmt = insert_stmt.on_conflict_do_nothing(
-                    index_elements=[Trade.trade_pk]
+                page_inserted, stop_reached = _ingest_trades_page(
+                    session,
+                    trades,
+                    stop_ts,
+                    settings,
+                    wallet_cache,
+                    market_cache,
+                    tag_index,
                 )
-                result = session.execute(stmt)
-                processed += 1
-
-                if result.rowcount and result.rowcount > 0:
-                    inserted += 1
-                    _update_wallets_and_signals(
-                        session,
-                        trade,
-                        notional,
-                        trade_ts,
-                        settings,
-                        wallet_cache,
-                        market_cache,
-                        tag_index,
-                    )
-
-            session.commit()
-            session.expire_all()
-            pages += 1
+                inserted += page_inserted
+                pages += 1
 
-            if stop_reached:
-                break
-            if len(trades) < settings.TRADES_PAGE_LIMIT:
-                break
-            offset += settings.TRADES_PAGE_LIMIT
-    finally:
-        client.close()
+                if stop_reached or len(trades) < page_limit:
+                    done = True
+                    break
+                offset += page_limit
+            window = min(window * 2, settings.HTTP_MAX_CONCURRENCY)
 
+    # One commit per run: pages come newest first and the next run resumes
+    # from the newest stored trade, so committing part of a run would skip
+    # the older pages if a later page failed.
+    session.commit()
     return inserted
 
 
+def _trades_params(settings: AppSettings, offset: int) -> dict[str, Any]:
+    return {
+        "limit": settings.TRADES_PAGE_LIMIT,
+        "offset": offset,
+        "takerOnly": str(settings.TAKER_ONLY).lower(),
+        "filterType": "CASH",
+        "filterAmount": settings.LARGE_TRADE_USD_THRESHOLD,
+    }
+
+
+def _ingest_trades_page(
+    session: Session,
+    trades: list[dict[str, Any]],
+    stop_ts: datetime | None,
+    settings: AppSettings,
+    wallet_cache: dict[str, Wallet],
+    market_cache: dict[str, Market],
+    tag_index: dict[int, Tag],
+) -> tuple[int, bool]:
+    stop_reached = False
+    rows: list[dict[str, Any]] = []
+    accepted: list[tuple[dict[str, Any], str, Decimal, datetime]] = []
+    for trade in trades:
+        trade_ts = parse_trade_ts(trade.get("timestamp"))
+        if trade_ts is None:
+            continue
+        trade_ts = ensure_utc(trade_ts)
+        if stop_ts and trade_ts < stop_ts:
+            stop_reached = True
+            break
+
+        side = trade.get("side")
+        if side not in (TradeSide.BUY.value, TradeSide.SELL.value):
+            continue
+        if not trade.get("conditionId") or not trade.get("asset"):
+            continue
+
+        price = to_decimal(trade.get("price"))
+        size = to_decimal(trade.get("size"))
+        notional = compute_notional(price, size)
+        if notional is None:
+            continue
+        dedupe = trade_dedupe_key(trade)
+
+        rows.append(
+            {
+                "trade_pk": dedupe,
+                "transaction_hash": trade.get("transactionHash"),
+                "wallet": trade.get("proxyWallet"),
+                "condition_id": trade.get("conditionId"),
+                "token_id": trade.get("asset"),
+                "side": TradeSide(side),
+                "price": price,
+                "size": size,
+                "notional_usd": notional,
+                "trade_ts": trade_ts,
+                "raw": trade,
+            }
+        )
+        accepted.append((trade, dedupe, notional, trade_ts))
+
+    if not rows:
+        return 0, stop_reached
+
+    inserted_pks = set(
+        session.execute(_TRADE_INSERTS[dialect_insert(session)], rows).scalars()
+    )
+
+    inserted_trades = [
+        trade for trade, dedupe, _, _ in accepted if dedupe in inserted_pks
+    ]
+    _load_wallets(
+        session,
+        {
+            trade["proxyWallet"]
+            for trade in inserted_trades
+            if trade.get("proxyWallet") and trade["proxyWallet"] not in wallet_cache
+        },
+        wallet_cache,
+    )
+    metrics_cache = _latest_market_metrics(
+        session, {trade["conditionId"] for trade in inserted_trades}
+    )
+    low_liquidity_cids = {
+        condition_id
+        for condition_id, metrics in metrics_cache.items()
+        if metrics["market_liquidity"] is not None
+        and metrics["market_liquidity"] < settings.MIN_GAMMA_LIQUIDITY
+    }
+    inserted = 0
+    signal_rows: list[dict[str, Any]] = []
+    for trade, dedupe, notional, trade_ts in accepted:
+        if dedupe not in inserted_pks:
+            continue
+        inserted_pks.discard(dedupe)
+        inserted += 1
+        _update_wallets_and_signals(
+            session,
+            trade,
+            dedupe,
+            notional,
+            trade_ts,
+            settings,
+            wallet_cache,
+            market_cache,
+            tag_index,
+            metrics_cache,
+            low_liquidity_cids,
+            signal_rows,
+            utc_now(),
+        )
+    _flush_signals(session, signal_rows)
+    return inserted, stop_reached
+
+
+def _load_wallets(
+    session: Session, addresses: set[str], wallet_cache: dict[str, Wallet]
+) -> None:
+    if not addresses:
+        return
+    wallets = session.execute(select(Wallet).where(Wallet.wallet.in_(addresses)))
+    for wallet in wallets.scalars():
+        wallet_cache[wallet.wallet] = wallet
+
+
 def _update_wallets_and_signals(
     session: Session,
     trade: dict[str, Any],
+    trade_key: str,
     notional: Decimal,
     trade_ts: datetime,
     settings: AppSettings,
     wallet_cache: dict[str, Wallet],
     market_cache: dict[str, Market],
     tag_index: dict[int, Tag],
+    metrics_cache: dict[str, dict[str, Any]],
+    low_liquidity_cids: set[str],
+    signal_rows: list[dict[str, Any]],
+    now: datetime,
 ) -> None:
     wallet_address = trade.get("proxyWallet")
     wallet = None
     wallet_was_dormant = False
     track_until = None
     if settings.TRACK_WALLET_DAYS_AFTER_LARGE_TRADE > 0:
-        track_until = utc_now() + timedelta(
-            days=settings.TRACK_WALLET_DAYS_AFTER_LARGE_TRADE
-        )
+        track_until = now + timedelta(days=settings.TRACK_WALLET_DAYS_AFTER_LARGE_TRADE)
     if wallet_address:
         wallet = wallet_cache.get(wallet_address)
-        if wallet is None:
-            wallet = session.get(Wallet, wallet_address)
-            if wallet is not None:
-                wallet_cache[wallet_address] = wallet
-
         if wallet is None:
             wallet = Wallet(
                 wallet=wallet_address,
-                first_seen_at=utc_now(),
-                last_seen_at=utc_now(),
+                first_seen_at=now,
+                last_seen_at=now,
                 first_trade_ts=trade_ts,
                 tracked_until=track_until,
                 lifetime_notional_usd=notional,
@@ -398,7 +540,7 @@ def _update_wallets_and_signals(
             wallet_cache[wallet_address] = wallet
         else:
             wallet_was_dormant = is_dormant(wallet, trade_ts, settings)
-            wallet.last_seen_at = utc_now()
+            wallet.last_seen_at = now
             wallet.lifetime_notional_usd = (
                 wallet.lifetime_notional_usd + notional
                 if wallet.lifetime_notional_usd is not None
@@ -413,14 +555,8 @@ def _update_wallets_and_signals(
                 wallet.tracked_until = desired_tracked_until
 
     condition_id = trade.get("conditionId")
-    market_metrics = (
-        _latest_market_metrics(session, condition_id) if condition_id else None
-    )
-    low_liquidity = False
-    if market_metrics and market_metrics.get("market_liquidity") is not None:
-        low_liquidity = (
-            market_metrics["market_liquidity"] < settings.MIN_GAMMA_LIQUIDITY
-        )
+    market_metrics = metrics_cache.get(condition_id)
+    low_liquidity = condition_id in low_liquidity_cids
 
     is_new = wallet is not None and is_new_wallet(wallet, trade_ts, settings)
     severity = severity_for_trade(notional, is_new=is_new, low_liquidity=low_liquidity)
@@ -446,36 +582,38 @@ def _update_wallets_and_signals(
         market_slug=trade.get("slug") or market_slug,
     )
 
-    _emit_signal(session, SignalType.LARGE_TAKER_TRADE, trade, payload, severity)
-
+    signal_types = [SignalType.LARGE_TAKER_TRADE]
     if is_new:
-        _emit_signal(
-            session, SignalType.LARGE_NEW_WALLET_TRADE, trade, payload, severity
-        )
-
+        signal_types.append(SignalType.LARGE_NEW_WALLET_TRADE)
     if wallet is not None and wallet_was_dormant:
-        _emit_signal(
-            session, SignalType.DORMANT_WALLET_REACTIVATION, trade, payload, severity
-        )
+        signal_types.append(SignalType.DORMANT_WALLET_REACTIVATION)
+    for signal_type in signal_types:
+        _emit_signal(signal_rows, signal_type, trade, trade_key, payload, severity, now)
 
 
 def _emit_signal(
-    session: Session,
+    signal_rows: list[dict[str, Any]],
     signal_type: SignalType,
     trade: dict[str, Any],
+    trade_key: str,
     payload: dict[str, Any],
     severity: int,
+    now: datetime,
 ) -> None:
-    dedupe_key = f"{signal_type}:{trade_dedupe_key(trade)}"
-
-    insert_stmt = _dialect_insert(session)(SignalEvent).values(
-        signal_type=signal_type,
-        dedupe_key=dedupe_key,
-        created_at=utc_now(),
-        severity=severity,
-        wallet=trade.get("proxyWallet"),
-        condition_id=trade.get("conditionId"),
-        payload=payload,
+    signal_rows.append(
+        {
+            "signal_type": signal_type,
+            "dedupe_key": _SIGNAL_PREFIXES[signal_type] + trade_key,
+            "created_at": now,
+            "severity": severity,
+            "wallet": trade.get("proxyWallet"),
+            "condition_id": trade.get("conditionId"),
+            "payload": payload,
+        }
     )
-    stmt = insert_stmt.on_conflict_do_nothing(index_elements=[SignalEvent.dedupe_key])
-    session.execute(stmt)
+
+
+def _flush_signals(session: Session, signal_rows: list[dict[str, Any]]) -> None:
+    if not signal_rows:
+        return
+    session.execute(_SIGNAL_INSERTS[dialect_insert(session)], signal_rows)
@@ -1,27 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 from typing import Any
 
 import httpx
+import orjson
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-from sqlalchemy import update
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from polymercado.config import AppSettings
-from polymercado.ingestion.http import fetch_json
+from polymercado.db import bulk_insert, dialect_insert
+from polymercado.ingestion.http import (
+    build_async_client,
+    fetch_json,
+    fetch_json_async,
+    get_client,
+    run_coroutine,
+)
 from polymercado.models import Market, MarketMetricsTS, SignalEvent, SignalType, Tag
 from polymercado.utils import parse_datetime, parse_jsonish_array, to_decimal, utc_now
 
 GAMMA_BASE = "https://gamma-api.polymarket.com"
 
 
-def _dialect_insert(session: Session):
-    if session.bind and session.bind.dialect.name == "sqlite":
-        return sqlite_insert
-    return pg_insert
-
-
 def _parse_tag_id(value: Any) -> int | None:
     if value is None:
         return None
@@ -31,41 +35,76 @@ def _parse_tag_id(value: Any) -> int | None:
         return None
 
 
-def sync_tag_metadata(session: Session, settings: AppSettings) -> int:
-    client = httpx.Client(timeout=settings.HTTP_TIMEOUT_SECONDS)
-    processed = 0
-    try:
-        processed += _sync_tags(client, session, settings)
-        sport_tag_ids = _sync_sports(client)
-        if sport_tag_ids is not None:
-            session.execute(update(Tag).values(is_sport=False))
-            if sport_tag_ids:
-                session.execute(
-                    update(Tag)
-                    .where(Tag.id.in_(sorted(sport_tag_ids)))
-                    .values(is_sport=True)
+async def _fetch_pages(
+    settings: AppSettings,
+    url: str,
+    params: dict[str, Any],
+    limit: int,
+    max_pages: int,
+    stop_on_short_page: bool,
+    cache_ttl: float = 0,
+) -> list[list[dict[str, Any]]]:
+    pages: list[list[dict[str, Any]]] = []
+    async with build_async_client(settings) as client:
+        window = 1
+        while len(pages) < max_pages:
+            offset = len(pages) * limit
+            fetched = await asyncio.gather(
+                *(
+                    fetch_json_async(
+                        client,
+                        url,
+                        params={**params, "limit": limit, "offset": offset + i * limit},
+                        cache_ttl=cache_ttl,
+                    )
+                    for i in range(min(window, max_pages - len(pages)))
                 )
-    finally:
-        client.close()
+            )
+            for page in fetched:
+                if not page:
+                    return pages
+                pages.append(page)
+                if stop_on_short_page and len(page) < limit:
+                    return pages
+            window = min(window * 2, settings.HTTP_MAX_CONCURRENCY)
+    return pages
+
+
+def sync_tag_metadata(session: Session, settings: AppSettings) -> int:
+    processed = _sync_tags(session, settings)
+    sport_tag_ids = _sync_sports(get_client(settings))
+    if sport_tag_ids is not None:
+        session.execute(update(Tag).values(is_sport=False))
+        if sport_tag_ids:
+            session.execute(
+                update(Tag)
+                .where(Tag.id.in_(sorted(sport_tag_ids)))
+                .values(is_sport=True)
+            )
 
     session.commit()
     return processed
 
 
-def _sync_tags(client: httpx.Client, session: Session, settings: AppSettings) -> int:
+def _sync_tags(session: Session, settings: AppSettings) -> int:
+    pages = run_coroutine(
+        _fetch_pages(
+            settings,
+            f"{GAMMA_BASE}/tags",
+            {},
+            settings.TAGS_PAGE_LIMIT,
+            settings.TAGS_MAX_PAGES,
+            stop_on_short_page=True,
+            cache_ttl=900,
+        )
+    )
     processed = 0
-    offset = 0
-    limit = settings.TAGS_PAGE_LIMIT
-    for _ in range(settings.TAGS_MAX_PAGES):
-        params = {"limit": limit, "offset": offset}
-        tags = fetch_json(client, f"{GAMMA_BASE}/tags", params=params)
-        if not tags:
-            break
+    for tags in pages:
         for tag in tags:
             tag_id = _parse_tag_id(tag.get("id"))
             if tag_id is None:
                 continue
-            insert_stmt = _dialect_insert(session)(Tag).values(
+            insert_stmt = dialect_insert(session)(Tag).values(
                 id=tag_id,
                 label=tag.get("label"),
                 slug=tag.get("slug"),
@@ -79,15 +118,12 @@ def _sync_tags(client: httpx.Client, session: Session, settings: AppSettings) ->
             )
             session.execute(stmt)
             processed += 1
-        if len(tags) < limit:
-            break
-        offset += limit
     return processed
 
 
 def _sync_sports(client: httpx.Client) -> set[int] | None:
     try:
-        sports = fetch_json(client, f"{GAMMA_BASE}/sports")
+        sports = fetch_json(client, f"{GAMMA_BASE}/sports", cache_ttl=3600)
     except httpx.HTTPError:
         return None
     if not sports:
@@ -154,123 +190,211 @@ def parse_market(market: dict[str, Any], event: dict[str, Any]) -> dict[str, Any
     }
 
 
-def upsert_market(session: Session, values: dict[str, Any]) -> None:
-    market_columns = set(Market.__table__.columns.keys())
-    insert_stmt = _dialect_insert(session)(Market).values(
-        **{k: v for k, v in values.items() if k in market_columns}
+_MARKET_COLUMNS = frozenset(Market.__table__.columns.keys())
+_MARKET_UPDATE_COLUMNS = (
+    "market_id",
+    "event_id",
+    "slug",
+    "question",
+    "title",
+    "active",
+    "closed",
+    "tag_ids",
+    "neg_risk",
+    "outcomes",
+    "token_ids",
+    "start_time",
+    "end_time",
+    "updated_at",
+    "last_seen_at",
+    "content_hash",
+)
+
+
+def _market_upsert(insert_fn):
+    insert_stmt = insert_fn(Market)
+    return insert_stmt.on_conflict_do_update(
+        index_elements=[Market.condition_id],
+        set_={
+            key: getattr(insert_stmt.excluded, key) for key in _MARKET_UPDATE_COLUMNS
+        },
     )
-    update_values = {
-        key: getattr(insert_stmt.excluded, key)
-        for key in values
-        if key
-        in {
-            "market_id",
-            "event_id",
-            "slug",
-            "question",
-            "title",
-            "active",
-            "closed",
-            "tag_ids",
-            "neg_risk",
-            "outcomes",
-            "token_ids",
-            "start_time",
-            "end_time",
-            "updated_at",
-            "last_seen_at",
-        }
-    }
-    update_values["last_seen_at"] = insert_stmt.excluded.last_seen_at
 
-    stmt = insert_stmt.on_conflict_do_update(
-        index_elements=[Market.condition_id], set_=update_values
+
+_MARKET_UPSERTS = {
+    sqlite_insert: _market_upsert(sqlite_insert),
+    pg_insert: _market_upsert(pg_insert),
+}
+
+
+_MARKET_HASH_COLUMNS = tuple(
+    key for key in _MARKET_UPDATE_COLUMNS if key not in ("last_seen_at", "content_hash")
+)
+
+
+def _market_content_hash(row: dict[str, Any]) -> str:
+    raw = orjson.dumps([row[key] for key in _MARKET_HASH_COLUMNS])
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def _market_content_hashes(
+    session: Session, condition_ids: set[str]
+) -> dict[str, str | None]:
+    return dict(
+        session.execute(
+            select(Market.condition_id, Market.content_hash).where(
+                Market.condition_id.in_(condition_ids)
+            )
+        ).all()
     )
-    session.execute(stmt)
 
 
-def insert_metric_snapshot(
-    session: Session, condition_id: str, volume: float | None, liquidity: float | None
+def upsert_markets(
+    session: Session,
+    values_list: list[dict[str, Any]],
+    content_hashes: dict[str, str | None] | None = None,
 ) -> None:
-    if volume is None and liquidity is None:
+    rows: dict[str, dict[str, Any]] = {}
+    for values in values_list:
+        row = {key: values.get(key) for key in _MARKET_COLUMNS}
+        previous = rows.get(row["condition_id"])
+        if previous is not None:
+            # A repeat within the batch updates the row the first one inserted.
+            row["created_at"] = previous["created_at"]
+        rows[row["condition_id"]] = row
+    if not rows:
         return
-    snapshot = MarketMetricsTS(
-        condition_id=condition_id,
-        ts=utc_now(),
-        gamma_volume=volume,
-        gamma_liquidity=liquidity,
-    )
-    session.add(snapshot)
-
-
-def emit_new_market_signal(session: Session, values: dict[str, Any]) -> None:
-    payload = {
-        "condition_id": values["condition_id"],
-        "slug": values.get("slug"),
-        "title": values.get("title"),
-        "tags": values.get("tag_ids"),
-        "start_time": values.get("start_time").isoformat()
-        if values.get("start_time")
-        else None,
-        "end_time": values.get("end_time").isoformat()
-        if values.get("end_time")
-        else None,
-        "token_ids": values.get("token_ids"),
-    }
-    dedupe_key = f"NEW_MARKET:{values['condition_id']}"
-
-    insert_stmt = _dialect_insert(session)(SignalEvent).values(
-        signal_type=SignalType.NEW_MARKET,
-        dedupe_key=dedupe_key,
-        created_at=utc_now(),
-        severity=1,
-        condition_id=values["condition_id"],
-        payload=payload,
+    if content_hashes is None:
+        content_hashes = _market_content_hashes(session, set(rows))
+
+    changed: list[dict[str, Any]] = []
+    unchanged: list[str] = []
+    for condition_id, row in rows.items():
+        row["content_hash"] = _market_content_hash(row)
+        if content_hashes.get(condition_id) == row["content_hash"]:
+            unchanged.append(condition_id)
+        else:
+            changed.append(row)
+    if changed:
+        session.execute(_MARKET_UPSERTS[dialect_insert(session)], changed)
+    if unchanged:
+        session.execute(
+            update(Market)
+            .where(Market.condition_id.in_(unchanged))
+            .values(last_seen_at=utc_now())
+        )
+
+
+def insert_metric_snapshots(
+    session: Session, values_list: list[dict[str, Any]]
+) -> None:
+    now = utc_now()
+    rows = [
+        {
+            "condition_id": values["condition_id"],
+            "ts": now,
+            "gamma_volume": values.get("gamma_volume"),
+            "gamma_liquidity": values.get("gamma_liquidity"),
+        }
+        for values in values_list
+        if values.get("gamma_volume") is not None
+        or values.get("gamma_liquidity") is not None
+    ]
+    if rows:
+        bulk_insert(session, MarketMetricsTS, rows)
+
+
+def _new_market_signal_insert(insert_fn):
+    return insert_fn(SignalEvent).on_conflict_do_nothing(
+        index_elements=[SignalEvent.dedupe_key]
     )
-    stmt = insert_stmt.on_conflict_do_nothing(index_elements=[SignalEvent.dedupe_key])
-    session.execute(stmt)
 
 
-def sync_gamma_events(session: Session, settings: AppSettings) -> int:
-    client = httpx.Client(timeout=settings.HTTP_TIMEOUT_SECONDS)
-    processed = 0
+_NEW_MARKET_SIGNAL_INSERTS = {
+    sqlite_insert: _new_market_signal_insert(sqlite_insert),
+    pg_insert: _new_market_signal_insert(pg_insert),
+}
 
-    try:
-        offset = 0
-        for _ in range(settings.GAMMA_EVENTS_MAX_PAGES):
-            params = {
+
+def emit_new_market_signals(
+    session: Session, values_list: list[dict[str, Any]]
+) -> None:
+    now = utc_now()
+    rows: dict[str, dict[str, Any]] = {}
+    for values in values_list:
+        dedupe_key = f"NEW_MARKET:{values['condition_id']}"
+        if dedupe_key in rows:
+            continue
+        payload = {
+            "condition_id": values["condition_id"],
+            "slug": values.get("slug"),
+            "title": values.get("title"),
+            "tags": values.get("tag_ids"),
+            "start_time": values.get("start_time").isoformat()
+            if values.get("start_time")
+            else None,
+            "end_time": values.get("end_time").isoformat()
+            if values.get("end_time")
+            else None,
+            "token_ids": values.get("token_ids"),
+        }
+        rows[dedupe_key] = {
+            "signal_type": SignalType.NEW_MARKET,
+            "dedupe_key": dedupe_key,
+            "created_at": now,
+            "severity": 1,
+            "condition_id": values["condition_id"],
+            "payload": payload,
+        }
+    if rows:
+        session.execute(
+            _NEW_MARKET_SIGNAL_INSERTS[dialect_insert(session)], list(rows.values())
+        )
+
+
+def sync_gamma_events(session: Session, settings: AppSettings) -> int:
+    pages = run_coroutine(
+        _fetch_pages(
+            settings,
+            f"{GAMMA_BASE}/events",
+            {
                 "active": "true",
                 "closed": "false",
-                "limit": settings.GAMMA_EVENTS_PAGE_LIMIT,
-                "offset": offset,
                 "order": "id",
                 "ascending": "false",
-            }
-            events = fetch_json(client, f"{GAMMA_BASE}/events", params=params)
-            if not events:
-                break
-            for event in events:
-                for market in event.get("markets") or []:
-                    values = parse_market(market, event)
-                    condition_id = values.get("condition_id")
-                    if not condition_id:
-                        continue
-
-                    existing = session.get(Market, condition_id)
-                    if existing is None:
-                        emit_new_market_signal(session, values)
-
-                    upsert_market(session, values)
-                    insert_metric_snapshot(
-                        session,
-                        condition_id,
-                        values.get("gamma_volume"),
-                        values.get("gamma_liquidity"),
-                    )
-                    processed += 1
-            offset += settings.GAMMA_EVENTS_PAGE_LIMIT
-    finally:
-        client.close()
+                "include_chat": "false",
+                "include_template": "false",
+            },
+            settings.GAMMA_EVENTS_PAGE_LIMIT,
+            settings.GAMMA_EVENTS_MAX_PAGES,
+            stop_on_short_page=False,
+        )
+    )
+    processed = 0
+    for events in pages:
+        page_values: list[dict[str, Any]] = []
+        for event in events:
+            for market in event.get("markets") or []:
+                values = parse_market(market, event)
+                if values.get("condition_id"):
+                    page_values.append(values)
+        if not page_values:
+            continue
+
+        content_hashes = _market_content_hashes(
+            session, {values["condition_id"] for values in page_values}
+        )
+        emit_new_market_signals(
+            session,
+            [
+                values
+                for values in page_values
+                if values["condition_id"] not in content_hashes
+            ],
+        )
+        upsert_markets(session, page_values, content_hashes)
+        insert_metric_snapshots(session, page_values)
+        processed += len(page_values)
 
     session.commit()
     return processed
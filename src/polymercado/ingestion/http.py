@@ -1,9 +1,127 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import random
 import time
-from typing import Any
+from collections.abc import Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
 
 import httpx
+import orjson
+
+from polymercado.config import AppSettings
+
+_CLIENTS: dict[float, httpx.Client] = {}
+
+T = TypeVar("T")
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    # asyncio.run() refuses to start inside a running loop (e.g. when a sync
+    # job is called from async code); run the coroutine on a worker thread then.
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def get_client(settings: AppSettings) -> httpx.Client:
+    client = _CLIENTS.get(settings.HTTP_TIMEOUT_SECONDS)
+    if client is None:
+        client = _CLIENTS[settings.HTTP_TIMEOUT_SECONDS] = httpx.Client(
+            timeout=settings.HTTP_TIMEOUT_SECONDS,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return client
+
+
+@atexit.register
+def _close_clients() -> None:
+    for client in _CLIENTS.values():
+        client.close()
+    _CLIENTS.clear()
+
+
+_RESPONSE_CACHE: dict[tuple[str, bytes], tuple[float, Any]] = {}
+_RESPONSE_CACHE_MAXSIZE = 1024
+
+
+def _cache_key(url: str, params: dict[str, Any] | None) -> tuple[str, bytes]:
+    return url, orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+
+
+def _cache_get(
+    url: str, params: dict[str, Any] | None, cache_ttl: float
+) -> tuple[tuple[str, bytes] | None, Any]:
+    # Returns the cache key (None when caching is off) and any live entry.
+    if cache_ttl <= 0:
+        return None, None
+    key = _cache_key(url, params)
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is None:
+        return key, None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        _RESPONSE_CACHE.pop(key, None)
+        return key, None
+    return key, value
+
+
+def _cache_put(key: tuple[str, bytes], ttl: float, value: Any) -> None:
+    if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_MAXSIZE:
+        _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)), None)
+    _RESPONSE_CACHE[key] = (time.monotonic() + ttl, value)
+
+
+def _decode_response(
+    response: httpx.Response, key: tuple[str, bytes] | None, cache_ttl: float
+) -> Any:
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    if key is not None:
+        _cache_put(key, cache_ttl, data)
+    return data
+
+
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+def _retry_delay(
+    exc: httpx.HTTPError, attempt: int, max_attempts: int, backoff_seconds: float
+) -> float | None:
+    # None means the error should propagate: out of attempts or not retryable.
+    if attempt >= max_attempts:
+        return None
+    if isinstance(exc, httpx.HTTPStatusError):
+        if exc.response.status_code not in _RETRYABLE_STATUS_CODES:
+            return None
+        retry_after = exc.response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), _MAX_RETRY_DELAY_SECONDS)
+            except ValueError:
+                pass
+    elif not isinstance(exc, httpx.TransportError):
+        return None
+    delay = min(backoff_seconds * 2 ** (attempt - 1), _MAX_RETRY_DELAY_SECONDS)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def build_async_client(settings: AppSettings) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=settings.HTTP_TIMEOUT_SECONDS,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONCURRENCY,
+            max_keepalive_connections=settings.HTTP_MAX_CONCURRENCY,
+        ),
+    )
 
 
 def fetch_json(
@@ -12,15 +130,42 @@ def fetch_json(
     params: dict[str, Any] | None = None,
     max_attempts: int = 3,
     backoff_seconds: float = 0.5,
+    cache_ttl: float = 0,
+) -> Any:
+    key, cached = _cache_get(url, params, cache_ttl)
+    if cached is not None:
+        return cached
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return _decode_response(client.get(url, params=params), key, cache_ttl)
+        except httpx.HTTPError as exc:
+            delay = _retry_delay(exc, attempt, max_attempts, backoff_seconds)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+
+async def fetch_json_async(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, Any] | None = None,
+    max_attempts: int = 3,
+    backoff_seconds: float = 0.5,
+    cache_ttl: float = 0,
 ) -> Any:
+    key, cached = _cache_get(url, params, cache_ttl)
+    if cached is not None:
+        return cached
     attempt = 0
     while True:
         attempt += 1
         try:
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError:
-            if attempt >= max_attempts:
+            response = await client.get(url, params=params)
+            return _decode_response(response, key, cache_ttl)
+        except httpx.HTTPError as exc:
+            delay = _retry_delay(exc, attempt, max_attempts, backoff_seconds)
+            if delay is None:
                 raise
-            time.sleep(backoff_seconds * attempt)
+            await asyncio.sleep(delay)
@@ -1,93 +1,114 @@
 from __future__ import annotations
 
-from typing import Sequence
+import time
+from typing import Any, Sequence
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import func, or_, select
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 
 from polymercado.config import AppSettings
-from polymercado.markets import compute_market_score
 from polymercado.models import Market, MarketMetricsTS, TrackedMarket
 
 
-def select_tracked_markets(session: Session, settings: AppSettings) -> Sequence[str]:
-    metrics_latest = (
-        select(
-            MarketMetricsTS.condition_id,
-            func.max(MarketMetricsTS.ts).label("max_ts"),
+def _latest_metrics(session: Session):
+    if session.bind and session.bind.dialect.name == "postgresql":
+        return (
+            select(MarketMetricsTS)
+            .distinct(MarketMetricsTS.condition_id)
+            .order_by(MarketMetricsTS.condition_id, MarketMetricsTS.ts.desc())
+            .subquery()
         )
-        .group_by(MarketMetricsTS.condition_id)
-        .subquery()
-    )
 
-    metrics = (
-        select(MarketMetricsTS)
-        .join(
-            metrics_latest,
-            and_(
-                MarketMetricsTS.condition_id == metrics_latest.c.condition_id,
-                MarketMetricsTS.ts == metrics_latest.c.max_ts,
-            ),
+    # One row per market even when snapshots share a timestamp, so a LIMIT
+    # over the join is never spent on duplicates.
+    ranked = select(
+        MarketMetricsTS,
+        func.row_number()
+        .over(
+            partition_by=MarketMetricsTS.condition_id,
+            order_by=MarketMetricsTS.ts.desc(),
         )
-        .subquery()
+        .label("rank"),
+    ).subquery()
+    return select(ranked).where(ranked.c.rank == 1).subquery()
+
+
+_TRACKED_CACHE: dict[
+    tuple[Engine | Connection | None, tuple[Any, ...]], tuple[float, list[str]]
+] = {}
+_TRACKED_CACHE_MAXSIZE = 8
+
+
+def invalidate_tracked_markets_cache() -> None:
+    _TRACKED_CACHE.clear()
+
+
+def select_tracked_markets(session: Session, settings: AppSettings) -> Sequence[str]:
+    ttl = settings.TRACKED_MARKETS_CACHE_SECONDS
+    if not ttl:
+        return _select_tracked_markets(session, settings)
+
+    key = (
+        session.get_bind(),
+        (
+            settings.MAX_TRACKED_MARKETS,
+            settings.MIN_GAMMA_VOLUME,
+            settings.MIN_GAMMA_LIQUIDITY,
+            settings.MIN_OPEN_INTEREST,
+            settings.market_score_weights,
+        ),
     )
+    entry = _TRACKED_CACHE.get(key)
+    if entry is not None and entry[0] >= time.monotonic():
+        return list(entry[1])
 
-    query = select(
-        Market.condition_id,
-        Market.active,
-        Market.closed,
-        metrics.c.gamma_volume,
-        metrics.c.gamma_liquidity,
-        metrics.c.open_interest,
-        metrics.c.spread_yes,
-        metrics.c.spread_no,
-    ).join(metrics, Market.condition_id == metrics.c.condition_id, isouter=True)
-
-    rows = session.execute(query).all()
-
-    auto: list[tuple[float, str]] = []
-    for row in rows:
-        active = row.active
-        closed = row.closed
-        if active is False or closed is True:
-            continue
+    picked = _select_tracked_markets(session, settings)
+    if len(_TRACKED_CACHE) >= _TRACKED_CACHE_MAXSIZE:
+        _TRACKED_CACHE.pop(next(iter(_TRACKED_CACHE)), None)
+    _TRACKED_CACHE[key] = (time.monotonic() + ttl, picked)
+    return list(picked)
 
-        has_metrics = (
-            row.gamma_volume is not None
-            or row.gamma_liquidity is not None
-            or row.open_interest is not None
-        )
-        meets_threshold = (
-            (
-                row.gamma_volume is not None
-                and row.gamma_volume >= settings.MIN_GAMMA_VOLUME
-            )
-            or (
-                row.gamma_liquidity is not None
-                and row.gamma_liquidity >= settings.MIN_GAMMA_LIQUIDITY
-            )
-            or (
-                row.open_interest is not None
-                and row.open_interest >= settings.MIN_OPEN_INTEREST
-            )
-        )
-        if has_metrics and not meets_threshold:
-            continue
-        auto.append(
-            (
-                compute_market_score(
-                    row.gamma_volume,
-                    row.gamma_liquidity,
-                    row.open_interest,
-                    row.spread_yes,
-                    row.spread_no,
-                    settings,
-                ),
-                row.condition_id,
-            )
+
+def _select_tracked_markets(session: Session, settings: AppSettings) -> list[str]:
+    metrics = _latest_metrics(session)
+
+    volume = func.coalesce(metrics.c.gamma_volume, 0)
+    liquidity = func.coalesce(metrics.c.gamma_liquidity, 0)
+    open_interest = func.coalesce(metrics.c.open_interest, 0)
+    score = (
+        settings.MARKET_SCORE_W1 * func.ln(1 + volume)
+        + settings.MARKET_SCORE_W2 * func.ln(1 + liquidity)
+        + settings.MARKET_SCORE_W3 * func.ln(1 + open_interest)
+        - settings.MARKET_SCORE_W4
+        * (
+            func.coalesce(metrics.c.spread_yes, 0)
+            + func.coalesce(metrics.c.spread_no, 0)
         )
+    ).label("score")
+    has_metrics = or_(
+        metrics.c.gamma_volume.is_not(None),
+        metrics.c.gamma_liquidity.is_not(None),
+        metrics.c.open_interest.is_not(None),
+    )
+    meets_threshold = or_(
+        metrics.c.gamma_volume >= settings.MIN_GAMMA_VOLUME,
+        metrics.c.gamma_liquidity >= settings.MIN_GAMMA_LIQUIDITY,
+        metrics.c.open_interest >= settings.MIN_OPEN_INTEREST,
+    )
 
-    auto.sort(key=lambda item: item[0], reverse=True)
+    query = (
+        select(Market.condition_id)
+        .join(metrics, Market.condition_id == metrics.c.condition_id, isouter=True)
+        .where(
+            or_(Market.active.is_(True), Market.active.is_(None)),
+            or_(Market.closed.is_(False), Market.closed.is_(None)),
+            or_(~has_metrics, meets_threshold),
+        )
+        .order_by(score.desc(), Market.condition_id)
+        .limit(settings.MAX_TRACKED_MARKETS)
+    )
+    auto = session.execute(query).scalars().all()
 
     manual = (
         session.execute(
@@ -107,7 +128,7 @@ def select_tracked_markets(session: Session, settings: AppSettings) -> Sequence[
         if len(picked) >= settings.MAX_TRACKED_MARKETS:
             return picked
 
-    for _, condition_id in auto:
+    for condition_id in auto:
         if condition_id in seen:
             continue
         seen.add(condition_id)
@@ -1,47 +1,53 @@
 from __future__ import annotations
 
 import time
-from typing import Callable
+from typing import Any, Callable
 
 from sqlalchemy.orm import Session
 
+from polymercado.db import dialect_insert
 from polymercado.models import JobRun
 from polymercado.utils import utc_now
 
-
 JobFunc = Callable[[Session], int]
 
 
+def _record_job_run(session: Session, job_name: str, **values: Any) -> None:
+    insert_stmt = dialect_insert(session)(JobRun).values(job_name=job_name, **values)
+    session.execute(
+        insert_stmt.on_conflict_do_update(index_elements=[JobRun.job_name], set_=values)
+    )
+
+
 def run_job(session: Session, job_name: str, func: JobFunc) -> int:
     started_at = utc_now()
-    job_run = session.get(JobRun, job_name)
-    if job_run is None:
-        job_run = JobRun(job_name=job_name)
-        session.add(job_run)
-    job_run.last_started_at = started_at
+    # Commit straight away: leaving it pending would hold a write transaction
+    # (SQLite's database lock) open across the job's HTTP fetches.
+    _record_job_run(session, job_name, last_started_at=started_at)
     session.commit()
 
     start_time = time.monotonic()
     try:
         processed = func(session)
-        job_run.last_success_at = utc_now()
-        job_run.last_error = None
-        job_run.last_error_at = None
-        return processed
     except Exception as exc:
         session.rollback()
-        job_run = session.get(JobRun, job_name)
-        if job_run is None:
-            job_run = JobRun(job_name=job_name)
-            session.add(job_run)
-        job_run.last_error_at = utc_now()
-        job_run.last_error = str(exc)
-        raise
-    finally:
-        duration_ms = (time.monotonic() - start_time) * 1000
-        job_run = session.get(JobRun, job_name)
-        if job_run is None:
-            job_run = JobRun(job_name=job_name)
-            session.add(job_run)
-        job_run.last_duration_ms = duration_ms
+        _record_job_run(
+            session,
+            job_name,
+            last_started_at=started_at,
+            last_error_at=utc_now(),
+            last_error=str(exc),
+            last_duration_ms=(time.monotonic() - start_time) * 1000,
+        )
         session.commit()
+        raise
+    _record_job_run(
+        session,
+        job_name,
+        last_success_at=utc_now(),
+        last_error=None,
+        last_error_at=None,
+        last_duration_ms=(time.monotonic() - start_time) * 1000,
+    )
+    session.commit()
+    return processed
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import math
 
-from polymercado.config import AppSettings
 from polymercado.utils import safe_lower
 
 
@@ -27,15 +26,13 @@ def compute_market_score(
     open_interest: float | None,
     spread_yes: float | None,
     spread_no: float | None,
-    settings: AppSettings,
+    weights: tuple[float, float, float, float],
 ) -> float:
-    volume_value = float(volume or 0)
-    liquidity_value = float(liquidity or 0)
-    oi_value = float(open_interest or 0)
+    w_volume, w_liquidity, w_oi, w_spread = weights
     spread_penalty = float(spread_yes or 0) + float(spread_no or 0)
     return (
-        settings.MARKET_SCORE_W1 * math.log1p(volume_value)
-        + settings.MARKET_SCORE_W2 * math.log1p(liquidity_value)
-        + settings.MARKET_SCORE_W3 * math.log1p(oi_value)
-        - settings.MARKET_SCORE_W4 * spread_penalty
+        w_volume * math.log1p(float(volume or 0))
+        + w_liquidity * math.log1p(float(liquidity or 0))
+        + w_oi * math.log1p(float(open_interest or 0))
+        - w_spread * spread_penalty
     )
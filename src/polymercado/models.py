@@ -68,6 +68,7 @@ class Market(Base):
     created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     last_seen_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    content_hash: Mapped[str | None] = mapped_column(String, nullable=True)
 
 
 class Tag(Base):
@@ -170,6 +171,8 @@ class Wallet(Base):
     )
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    __table_args__ = (Index("ix_wallets_first_seen", "first_seen_at"),)
+
 
 class WalletMarketExposure(Base):
     __tablename__ = "wallet_market_exposure"
@@ -218,6 +221,7 @@ class AlertLog(Base):
 
     __table_args__ = (
         Index("ix_alert_notification_sent", "notification_key", "sent_at"),
+        Index("ix_alert_signal_event", "signal_event_id"),
     )
 
 
@@ -2,8 +2,19 @@ from __future__ import annotations
 
 from datetime import timedelta
 from decimal import Decimal
-
-from sqlalchemy import func, select
+from typing import Any
+
+from sqlalchemy import (
+    Float,
+    Numeric,
+    case,
+    cast,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+)
 from sqlalchemy.orm import Session
 
 from polymercado.config import AppSettings
@@ -19,12 +30,52 @@ from polymercado.models import (
 )
 from polymercado.utils import to_decimal, utc_now
 
+_NUMERIC_TEXT = r"^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$"
+
+
+def _scan_orderbooks(session: Session, token_ids: list[str]):
+    # One row per stored book side, plus one per level price outside [0,1]
+    # (NULL when there is none). Callers re-check prices with to_decimal, so
+    # the SQL side may be a loose superset.
+    if session.bind and session.bind.dialect.name == "postgresql":
+        levels = (
+            func.json_array_elements(
+                case(
+                    (
+                        func.json_typeof(OrderbookLevels.levels) == "array",
+                        OrderbookLevels.levels,
+                    ),
+                    else_=cast(literal("[]"), OrderbookLevels.levels.type),
+                )
+            )
+            .table_valued("value", with_ordinality="position")
+            .render_derived()
+        )
+        raw_price = levels.c.value.op("->>")("price")
+        price = case((raw_price.regexp_match(_NUMERIC_TEXT), cast(raw_price, Numeric)))
+        position = levels.c.position
+    else:
+        levels = func.json_each(OrderbookLevels.levels).table_valued(
+            "key", "value", "type"
+        )
+        raw_price = case(
+            (levels.c.type == "object", func.json_extract(levels.c.value, "$.price"))
+        )
+        price = cast(raw_price, Float)
+        position = levels.c.key
+    return session.execute(
+        select(OrderbookLevels.token_id, OrderbookLevels.side, raw_price)
+        .outerjoin(levels, or_(price < 0, price > 1))
+        .where(OrderbookLevels.token_id.in_(token_ids))
+        .order_by(OrderbookLevels.token_id, OrderbookLevels.side, position)
+    ).all()
+
 
 def run_data_quality_checks(session: Session, settings: AppSettings) -> int:
     if not settings.DATA_QUALITY_ENABLED:
         return 0
 
-    issues: list[DataQualityIssue] = []
+    issues: list[dict[str, Any]] = []
     now = utc_now()
 
     tracked_ids = select_tracked_markets(session, settings)
@@ -52,23 +103,19 @@ def run_data_quality_checks(session: Session, settings: AppSettings) -> int:
         if missing_tokens:
             sample = ", ".join(missing_tokens[:5])
             issues.append(
-                DataQualityIssue(
-                    check_name="missing_token_ids",
-                    severity=3,
-                    message=(
+                {
+                    "check_name": "missing_token_ids",
+                    "severity": 3,
+                    "message": (
                         f"{len(missing_tokens)} tracked markets missing token ids. "
                         f"Sample: {sample}"
                     ),
-                    created_at=now,
-                )
+                    "created_at": now,
+                }
             )
 
         if token_ids:
-            rows = session.execute(
-                select(OrderbookLevels.token_id, OrderbookLevels.side).where(
-                    OrderbookLevels.token_id.in_(token_ids)
-                )
-            ).all()
+            rows = _scan_orderbooks(session, token_ids)
             present = {(row.token_id, row.side) for row in rows}
             missing_books: list[str] = []
             for token_id in token_ids:
@@ -82,102 +129,88 @@ def run_data_quality_checks(session: Session, settings: AppSettings) -> int:
             if missing_books:
                 sample = ", ".join(missing_books[:5])
                 issues.append(
-                    DataQualityIssue(
-                        check_name="missing_orderbooks",
-                        severity=3,
-                        message=(
+                    {
+                        "check_name": "missing_orderbooks",
+                        "severity": 3,
+                        "message": (
                             f"{len(missing_books)} tracked tokens missing book sides. "
                             f"Sample: {sample}"
                         ),
-                        created_at=now,
-                    )
+                        "created_at": now,
+                    }
                 )
 
             out_of_bounds: list[str] = []
-            books = (
-                session.execute(
-                    select(OrderbookLevels).where(
-                        OrderbookLevels.token_id.in_(token_ids)
-                    )
-                )
-                .scalars()
-                .all()
-            )
-            for book in books:
-                levels = book.levels or []
-                for level in levels:
-                    price = (
-                        to_decimal(level.get("price"))
-                        if isinstance(level, dict)
-                        else None
-                    )
-                    if price is None:
-                        continue
-                    if price < 0 or price > 1:
-                        out_of_bounds.append(f"{book.token_id}:{price}")
-                        break
+            flagged: set[tuple[str, OrderbookSide]] = set()
+            for token_id, side, raw_price in rows:
+                price = to_decimal(raw_price)
+                if price is None or (token_id, side) in flagged:
+                    continue
+                if price < 0 or price > 1:
+                    flagged.add((token_id, side))
+                    out_of_bounds.append(f"{token_id}:{price}")
 
             if out_of_bounds:
                 sample = ", ".join(out_of_bounds[:5])
                 issues.append(
-                    DataQualityIssue(
-                        check_name="orderbook_price_bounds",
-                        severity=4,
-                        message=(
+                    {
+                        "check_name": "orderbook_price_bounds",
+                        "severity": 4,
+                        "message": (
                             f"{len(out_of_bounds)} orderbook levels outside [0,1]. "
                             f"Sample: {sample}"
                         ),
-                        created_at=now,
-                    )
+                        "created_at": now,
+                    }
                 )
 
     trade_limit = settings.DATA_QUALITY_TRADE_SAMPLE_LIMIT
-    trades = (
-        session.execute(
-            select(Trade).order_by(Trade.trade_ts.desc()).limit(trade_limit)
+    recent_trades = (
+        select(Trade.price, Trade.size, Trade.notional_usd)
+        .order_by(Trade.trade_ts.desc())
+        .limit(trade_limit)
+        .subquery()
+    )
+    mismatches = session.scalar(
+        select(func.count())
+        .select_from(recent_trades)
+        .where(
+            func.abs(
+                recent_trades.c.price * recent_trades.c.size
+                - recent_trades.c.notional_usd
+            )
+            > Decimal("0.01")
         )
-        .scalars()
-        .all()
     )
-    mismatches = 0
-    for trade in trades:
-        price = to_decimal(trade.price)
-        size = to_decimal(trade.size)
-        notional = to_decimal(trade.notional_usd)
-        if price is None or size is None or notional is None:
-            continue
-        recomputed = price * size
-        if abs(recomputed - notional) > Decimal("0.01"):
-            mismatches += 1
 
     if mismatches:
         issues.append(
-            DataQualityIssue(
-                check_name="trade_notional_mismatch",
-                severity=2,
-                message=f"{mismatches} trades have notional mismatch > $0.01.",
-                created_at=now,
-            )
+            {
+                "check_name": "trade_notional_mismatch",
+                "severity": 2,
+                "message": f"{mismatches} trades have notional mismatch > $0.01.",
+                "created_at": now,
+            }
         )
 
     cutoff = now - timedelta(hours=1)
-    new_wallets = session.execute(
+    new_wallets = session.scalar(
         select(func.count()).select_from(Wallet).where(Wallet.first_seen_at >= cutoff)
-    ).scalar_one()
+    )
     if new_wallets > settings.DATA_QUALITY_MAX_NEW_WALLETS_PER_HOUR:
         issues.append(
-            DataQualityIssue(
-                check_name="new_wallet_rate",
-                severity=2,
-                message=(
+            {
+                "check_name": "new_wallet_rate",
+                "severity": 2,
+                "message": (
                     f"{new_wallets} wallets first seen in the last hour; "
                     f"threshold {settings.DATA_QUALITY_MAX_NEW_WALLETS_PER_HOUR}."
                 ),
-                created_at=now,
-            )
+                "created_at": now,
+            }
         )
 
     if issues:
-        session.add_all(issues)
+        session.execute(insert(DataQualityIssue), issues)
         session.commit()
     return len(issues)
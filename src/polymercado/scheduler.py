@@ -8,6 +8,7 @@ from sqlalchemy.orm import sessionmaker
 
 from polymercado.alerts.dispatcher import dispatch_alerts
 from polymercado.config import AppSettings
+from polymercado.db import checkpoint_wal, get_engine
 from polymercado.ingestion.clob import sync_orderbooks
 from polymercado.ingestion.data_api import (
     sync_large_trades,
@@ -105,6 +106,16 @@ def build_scheduler(
         coalesce=True,
     )
 
+    if settings.DATABASE_URL.startswith("sqlite"):
+        scheduler.add_job(
+            partial(checkpoint_wal, get_engine(settings.DATABASE_URL)),
+            "interval",
+            seconds=60,
+            id="checkpoint_wal",
+            max_instances=1,
+            coalesce=True,
+        )
+
     if settings.WALLET_POSITIONS_ENABLED:
         scheduler.add_job(
             with_session(
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from bisect import bisect_left
+from collections.abc import Hashable
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Iterable
@@ -7,6 +9,9 @@ from typing import Iterable
 from polymercado.config import AppSettings
 from polymercado.utils import to_decimal
 
+# Float edges within this of ARB_EDGE_MIN are re-checked in Decimal.
+_EDGE_TOLERANCE = 1e-9
+
 
 @dataclass(frozen=True)
 class Level:
@@ -27,6 +32,23 @@ def normalize_levels(levels: Iterable[dict[str, str]]) -> list[Level]:
     return normalized
 
 
+_LEVELS_CACHE: dict[Hashable, list[Level]] = {}
+_LEVELS_CACHE_MAXSIZE = 4096
+
+
+def normalize_levels_cached(
+    levels: Iterable[dict[str, str]], book_key: Hashable
+) -> list[Level]:
+    # book_key must identify the levels' content (e.g. token, side and hash).
+    normalized = _LEVELS_CACHE.get(book_key)
+    if normalized is None:
+        normalized = normalize_levels(levels)
+        if len(_LEVELS_CACHE) >= _LEVELS_CACHE_MAXSIZE:
+            _LEVELS_CACHE.pop(next(iter(_LEVELS_CACHE)), None)
+        _LEVELS_CACHE[book_key] = normalized
+    return list(normalized)
+
+
 def avg_ask(levels: list[Level], quantity: Decimal) -> Decimal | None:
     remaining = quantity
     cost = Decimal("0")
@@ -41,6 +63,54 @@ def avg_ask(levels: list[Level], quantity: Decimal) -> Decimal | None:
     return cost / quantity
 
 
+def _cumulative_fills(levels: list[Level]) -> tuple[list[Decimal], list[Decimal]]:
+    sizes: list[Decimal] = []
+    costs: list[Decimal] = []
+    size = Decimal(0)
+    cost = Decimal(0)
+    for level in levels:
+        size += level.size
+        cost += level.size * level.price
+        sizes.append(size)
+        costs.append(cost)
+    return sizes, costs
+
+
+def _avg_ask_from_fills(
+    levels: list[Level],
+    sizes: list[Decimal],
+    costs: list[Decimal],
+    quantity: Decimal,
+) -> Decimal | None:
+    # Same result as avg_ask, using the running totals from _cumulative_fills.
+    index = bisect_left(sizes, quantity)
+    if index == len(levels):
+        return None
+    size = sizes[index - 1] if index else Decimal(0)
+    cost = costs[index - 1] if index else Decimal(0)
+    return (cost + (quantity - size) * levels[index].price) / quantity
+
+
+def _float_fills(
+    levels: list[Level], sizes: list[Decimal], costs: list[Decimal]
+) -> tuple[list[float], list[float], list[float]]:
+    return (
+        [float(level.price) for level in levels],
+        [float(size) for size in sizes],
+        [float(cost) for cost in costs],
+    )
+
+
+def _avg_ask_float(
+    prices: list[float], sizes: list[float], costs: list[float], quantity: float
+) -> float:
+    # Callers check depth first, so the quantity can always be filled.
+    index = bisect_left(sizes, quantity)
+    size = sizes[index - 1] if index else 0.0
+    cost = costs[index - 1] if index else 0.0
+    return (cost + (quantity - size) * prices[index]) / quantity
+
+
 def fill_levels(levels: list[Level], quantity: Decimal) -> list[dict[str, str]]:
     remaining = quantity
     used: list[dict[str, str]] = []
@@ -88,30 +158,53 @@ def compute_arb(
         fee = base * fee_bps / Decimal("10000")
         return base + fee
 
-    edge_at_min = None
-    avg_yes_min = avg_ask(asks_yes, min_q)
-    avg_no_min = avg_ask(asks_no, min_q)
-    if avg_yes_min is not None and avg_no_min is not None:
-        total = total_cost(avg_yes_min, avg_no_min)
-        edge_at_min = Decimal("1") - total
+    fills_yes = _cumulative_fills(asks_yes)
+    fills_no = _cumulative_fills(asks_no)
 
-    q_max = None
-    edge_at_q_max = None
-    avg_yes_at_q_max = None
-    avg_no_at_q_max = None
-
-    for q in sorted_candidates:
-        avg_yes = avg_ask(asks_yes, q)
-        avg_no = avg_ask(asks_no, q)
+    def exact(q: Decimal) -> tuple[Decimal, Decimal, Decimal] | None:
+        avg_yes = _avg_ask_from_fills(asks_yes, *fills_yes, q)
+        avg_no = _avg_ask_from_fills(asks_no, *fills_no, q)
         if avg_yes is None or avg_no is None:
+            return None
+        return avg_yes, avg_no, Decimal(1) - total_cost(avg_yes, avg_no)
+
+    at_min = exact(min_q)
+    edge_at_min = at_min[2] if at_min is not None else None
+
+    # Scan from the largest candidate in floats; only the reported values and
+    # edges too close to the threshold to call are evaluated in Decimal.
+    depth = min(
+        fills_yes[0][-1] if fills_yes[0] else Decimal(0),
+        fills_no[0][-1] if fills_no[0] else Decimal(0),
+    )
+    floats_yes = _float_fills(asks_yes, *fills_yes)
+    floats_no = _float_fills(asks_no, *fills_no)
+    fee_rate = float(fee_bps) / 10000
+    edge_min_float = float(edge_min)
+
+    q_max = None
+    for q in reversed(sorted_candidates):
+        if q > depth:
             continue
-        total = total_cost(avg_yes, avg_no)
-        edge = Decimal("1") - total
-        if edge > edge_min:
+        quantity = float(q)
+        base = _avg_ask_float(*floats_yes, quantity) + _avg_ask_float(
+            *floats_no, quantity
+        )
+        edge = 1.0 - base * (1.0 + fee_rate)
+        if abs(edge - edge_min_float) <= _EDGE_TOLERANCE:
+            at_q = exact(q)
+            profitable = at_q is not None and at_q[2] > edge_min
+        else:
+            profitable = edge > edge_min_float
+        if profitable:
             q_max = q
-            edge_at_q_max = edge
-            avg_yes_at_q_max = avg_yes
-            avg_no_at_q_max = avg_no
+            break
+
+    avg_yes_at_q_max = None
+    avg_no_at_q_max = None
+    edge_at_q_max = None
+    if q_max is not None:
+        avg_yes_at_q_max, avg_no_at_q_max, edge_at_q_max = exact(q_max)
 
     return {
         "q_max": q_max,
@@ -120,3 +213,31 @@ def compute_arb(
         "avg_ask_yes_at_q_max": avg_yes_at_q_max,
         "avg_ask_no_at_q_max": avg_no_at_q_max,
     }
+
+
+_ARB_CACHE: dict[tuple[Hashable, ...], dict[str, Decimal | None]] = {}
+_ARB_CACHE_MAXSIZE = 1024
+
+
+def compute_arb_cached(
+    asks_yes: list[Level],
+    asks_no: list[Level],
+    book_key: Hashable,
+    settings: AppSettings,
+) -> dict[str, Decimal | None]:
+    # book_key must change whenever either ask book does (e.g. token ids and
+    # orderbook hashes); compute_arb is pure, so equal keys share a result.
+    key = (
+        book_key,
+        settings.ARB_MIN_EXECUTABLE_SHARES,
+        settings.ARB_MAX_SHARES_TO_EVALUATE,
+        settings.ARB_EDGE_MIN,
+        settings.TAKER_FEE_BPS,
+    )
+    result = _ARB_CACHE.get(key)
+    if result is None:
+        result = compute_arb(asks_yes, asks_no, settings)
+        if len(_ARB_CACHE) >= _ARB_CACHE_MAXSIZE:
+            _ARB_CACHE.pop(next(iter(_ARB_CACHE)), None)
+        _ARB_CACHE[key] = result
+    return dict(result)
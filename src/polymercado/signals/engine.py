@@ -4,11 +4,10 @@ from datetime import timedelta
 from decimal import Decimal
 
 from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from polymercado.config import AppSettings
+from polymercado.db import dialect_insert
 from polymercado.markets import resolve_binary_tokens
 from polymercado.models import (
     Market,
@@ -17,16 +16,17 @@ from polymercado.models import (
     SignalEvent,
     SignalType,
 )
-from polymercado.signals.arb import compute_arb, fill_levels, normalize_levels
+from polymercado.signals.arb import (
+    Level,
+    compute_arb,
+    compute_arb_cached,
+    fill_levels,
+    normalize_levels,
+    normalize_levels_cached,
+)
 from polymercado.utils import ensure_utc, utc_now
 
 
-def _dialect_insert(session: Session):
-    if session.bind and session.bind.dialect.name == "sqlite":
-        return sqlite_insert
-    return pg_insert
-
-
 def _severity(edge: Decimal, q_max: Decimal) -> int:
     edge_pct = float(edge)
     if edge_pct >= 0.015 and q_max >= Decimal("500"):
@@ -36,6 +36,14 @@ def _severity(edge: Decimal, q_max: Decimal) -> int:
     return 2
 
 
+def _ask_levels(book: OrderbookLevels) -> list[Level]:
+    if book.hash:
+        return normalize_levels_cached(
+            book.levels, (book.token_id, book.side, book.hash)
+        )
+    return normalize_levels(book.levels)
+
+
 def run_signal_engine(session: Session, settings: AppSettings) -> int:
     now = utc_now()
     processed = 0
@@ -65,12 +73,20 @@ def run_signal_engine(session: Session, settings: AppSettings) -> int:
         ):
             continue
 
-        asks_yes = normalize_levels(yes_asks.levels)
-        asks_no = normalize_levels(no_asks.levels)
+        asks_yes = _ask_levels(yes_asks)
+        asks_no = _ask_levels(no_asks)
         if not asks_yes or not asks_no:
             continue
 
-        result = compute_arb(asks_yes, asks_no, settings)
+        if yes_asks.hash and no_asks.hash:
+            result = compute_arb_cached(
+                asks_yes,
+                asks_no,
+                (yes_token, yes_asks.hash, no_token, no_asks.hash),
+                settings,
+            )
+        else:
+            result = compute_arb(asks_yes, asks_no, settings)
         q_max = result["q_max"]
         edge_at_q_max = result["edge_at_q_max"]
         edge_at_min = result["edge_at_min_q"]
@@ -134,7 +150,7 @@ def run_signal_engine(session: Session, settings: AppSettings) -> int:
         dedupe_key = f"ARB_BUY_BOTH:{market.condition_id}:{float(edge_at_q_max):.4f}:{float(q_max):.2f}"
         severity = _severity(edge_at_q_max, q_max)
 
-        insert_stmt = _dialect_insert(session)(SignalEvent).values(
+        insert_stmt = dialect_insert(session)(SignalEvent).values(
             signal_type=SignalType.ARB_BUY_BOTH,
             dedupe_key=dedupe_key,
             created_at=now,
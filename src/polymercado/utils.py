@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-import json
+import re
 from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from typing import Any
 
+import orjson
+
+_ARRAY_ITEM_RE = re.compile(r"""\s*["']*(.*?)["']*\s*(?:,|\Z)""", re.DOTALL)
+
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
@@ -26,15 +31,20 @@ def parse_datetime(value: Any) -> datetime | None:
     if isinstance(value, (int, float)):
         return datetime.fromtimestamp(value, tz=timezone.utc)
     if isinstance(value, str):
-        try:
-            if value.isdigit():
-                return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc)
-            return datetime.fromisoformat(value.replace("Z", "+00:00"))
-        except ValueError:
-            return None
+        return _parse_datetime_str(value)
     return None
 
 
+@lru_cache(maxsize=8192)
+def _parse_datetime_str(value: str) -> datetime | None:
+    try:
+        if value.isdigit():
+            return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc)
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
 def parse_jsonish_array(value: Any) -> list[str]:
     if value is None:
         return []
@@ -42,20 +52,18 @@ def parse_jsonish_array(value: Any) -> list[str]:
         return [str(item) for item in value if item is not None]
     if isinstance(value, str):
         stripped = value.strip()
-        if not stripped:
+        if not stripped or stripped == "[]":
             return []
+        if not stripped.startswith("["):
+            return [stripped]
         try:
-            parsed = json.loads(stripped)
-        except json.JSONDecodeError:
+            parsed = orjson.loads(stripped)
+        except orjson.JSONDecodeError:
             parsed = None
         if isinstance(parsed, list):
             return [str(item) for item in parsed if item is not None]
-        if stripped.startswith("[") and stripped.endswith("]"):
-            inner = stripped[1:-1].strip()
-            if not inner:
-                return []
-            parts = [part.strip() for part in inner.split(",")]
-            return [part.strip("\"'") for part in parts if part.strip("\"'")]
+        if stripped.endswith("]"):
+            return [item for item in _ARRAY_ITEM_RE.findall(stripped[1:-1]) if item]
         return [stripped]
     return [str(value)]
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from functools import partial
 from pathlib import Path
@@ -39,7 +40,8 @@ async def lifespan(app: FastAPI):
         )
         if not has_tags:
             try:
-                run_job(
+                await asyncio.to_thread(
+                    run_job,
                     session,
                     "sync_tag_metadata",
                     partial(sync_tag_metadata, settings=settings),
@@ -48,7 +50,8 @@ async def lifespan(app: FastAPI):
                 logger.warning("bootstrap tag sync failed: %s", exc)
         if not has_markets:
             try:
-                run_job(
+                await asyncio.to_thread(
+                    run_job,
                     session,
                     "sync_gamma_events",
                     partial(sync_gamma_events, settings=settings),
@@ -12,7 +12,8 @@ from sqlalchemy import and_, desc, func, select
 from sqlalchemy.orm import Session
 
 from polymercado.alerts.dispatcher import build_notification_key, format_message
-from polymercado.config import AppSettings, load_settings
+from polymercado.config import AppSettings, invalidate_settings_cache, load_settings
+from polymercado.ingestion.universe import invalidate_tracked_markets_cache
 from polymercado.markets import compute_market_score, resolve_binary_tokens
 from polymercado.models import (
     AlertAck,
@@ -195,6 +196,7 @@ def markets(request: Request) -> HTMLResponse:
 
         items: list[dict[str, Any]] = []
         now = utc_now()
+        weights = settings.market_score_weights
         for market, volume, liquidity, oi, spread_yes, spread_no in rows:
             tags = market.tag_ids or []
             if include_tags and not any(tag in tags for tag in include_tags):
@@ -217,7 +219,7 @@ def markets(request: Request) -> HTMLResponse:
                 continue
 
             score = compute_market_score(
-                volume, liquidity, oi, spread_yes, spread_no, settings
+                volume, liquidity, oi, spread_yes, spread_no, weights
             )
             yes_token, no_token = resolve_binary_tokens(
                 market.token_ids, market.outcomes
@@ -344,6 +346,7 @@ def track_market(
         else:
             row.enabled = True
         session.commit()
+        invalidate_tracked_markets_cache()
         return RedirectResponse(url=next_url, status_code=303)
     finally:
         session.close()
@@ -359,6 +362,7 @@ def untrack_market(
         if row is not None:
             row.enabled = False
             session.commit()
+            invalidate_tracked_markets_cache()
         return RedirectResponse(url=next_url, status_code=303)
     finally:
         session.close()
@@ -921,6 +925,7 @@ def update_config(
             row.value = parsed
             row.updated_at = utc_now()
         session.commit()
+        invalidate_settings_cache()
 
         settings = load_settings(session)
         request.app.state.settings = settings
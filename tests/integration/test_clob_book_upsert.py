@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from polymercado.ingestion.clob import upsert_orderbook
+from polymercado.ingestion.clob import upsert_orderbook, upsert_orderbooks
 from polymercado.models import OrderbookLevels, OrderbookSide
 
 
@@ -24,3 +24,39 @@ def test_upsert_orderbook(session):
     )
     assert bids is not None
     assert asks is not None
+
+
+def test_upsert_orderbooks_keeps_last_book_per_token(session):
+    fixture_path = Path("tests/fixtures/polymarket/clob_book.json")
+    payload = json.loads(fixture_path.read_text())
+    newer = {**payload, "hash": "newer", "asks": []}
+
+    upsert_orderbooks(session, [payload, newer])
+    session.commit()
+
+    asks = session.get(
+        OrderbookLevels,
+        {"token_id": payload["asset_id"], "side": OrderbookSide.ASK},
+    )
+    assert asks.hash == "newer"
+    assert asks.levels == []
+
+
+def test_upsert_orderbooks_skips_levels_for_unchanged_hash(session):
+    fixture_path = Path("tests/fixtures/polymarket/clob_book.json")
+    payload = json.loads(fixture_path.read_text())
+    stored_hashes = {}
+
+    upsert_orderbooks(session, [payload], stored_hashes)
+    session.commit()
+    later = {**payload, "asks": [], "timestamp": "2030-01-01T00:00:00Z"}
+    upsert_orderbooks(session, [later], stored_hashes)
+    session.commit()
+
+    asks = session.get(
+        OrderbookLevels,
+        {"token_id": payload["asset_id"], "side": OrderbookSide.ASK},
+    )
+    session.refresh(asks)
+    assert asks.levels == payload["asks"]
+    assert asks.as_of.year == 2030
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from polymercado.alerts.dispatcher import dispatch_alerts
+from polymercado.config import AppSettings
+from polymercado.models import (
+    AlertAck,
+    AlertLog,
+    AlertRule,
+    AlertStatus,
+    SignalEvent,
+    SignalType,
+)
+from polymercado.utils import utc_now
+
+
+def _add_signal(session, dedupe_key: str, severity: int, wallet: str) -> None:
+    session.add(
+        SignalEvent(
+            signal_type=SignalType.LARGE_TAKER_TRADE,
+            dedupe_key=dedupe_key,
+            created_at=utc_now(),
+            severity=severity,
+            wallet=wallet,
+            payload={"notional_usd": 20000},
+        )
+    )
+
+
+def _logs(session) -> list[AlertLog]:
+    return list(session.execute(select(AlertLog).order_by(AlertLog.id)).scalars())
+
+
+def test_dispatch_alerts_dedupes_by_notification_key(session):
+    settings = AppSettings(ALERT_CHANNELS="log", ALERT_RULES_ENABLED=False)
+    _add_signal(session, "first", 3, "0x1")
+    _add_signal(session, "second", 2, "0x1")
+    session.commit()
+
+    assert dispatch_alerts(session, settings) == 1
+    assert [(log.channel, log.status) for log in _logs(session)] == [
+        ("log", AlertStatus.SENT),
+        ("dedupe", AlertStatus.SUPPRESSED),
+    ]
+
+    _add_signal(session, "third", 2, "0x1")
+    session.commit()
+
+    assert dispatch_alerts(session, settings) == 0
+    assert _logs(session)[-1].channel == "dedupe"
+
+
+def test_dispatch_alerts_suppresses_acked_keys(session):
+    settings = AppSettings(ALERT_CHANNELS="log", ALERT_RULES_ENABLED=False)
+    _add_signal(session, "acked", 3, "0x2")
+    session.commit()
+    signal = session.execute(select(SignalEvent)).scalars().one()
+    now = utc_now()
+    session.add(
+        AlertAck(
+            notification_key=f"{signal.signal_type}:0x2",
+            acked_until=now + timedelta(hours=1),
+            created_at=now,
+        )
+    )
+    session.commit()
+
+    assert dispatch_alerts(session, settings) == 0
+    logs = _logs(session)
+    assert len(logs) == 1
+    assert logs[0].error == "acked"
+
+
+def test_dispatch_alerts_without_cooldown_skips_dedupe(session):
+    settings = AppSettings(
+        ALERT_CHANNELS="log",
+        ALERT_RULES_ENABLED=False,
+        ALERT_DEDUP_WINDOW_SECONDS=0,
+    )
+    _add_signal(session, "first", 3, "0x3")
+    _add_signal(session, "second", 2, "0x3")
+    session.commit()
+
+    assert dispatch_alerts(session, settings) == 2
+
+
+def test_dispatch_alerts_filters_signals_by_rule_columns(session):
+    settings = AppSettings(ALERT_CHANNELS="log", ALERT_RULES_ENABLED=True)
+    session.add(
+        AlertRule(
+            rule={"when": {"signal_type": "LARGE_TAKER_TRADE", "min_severity": 3}}
+        )
+    )
+    _add_signal(session, "low", 2, "0x4")
+    _add_signal(session, "high", 3, "0x5")
+    session.add(
+        SignalEvent(
+            signal_type=SignalType.ARB_BUY_BOTH,
+            dedupe_key="arb",
+            created_at=utc_now(),
+            severity=3,
+            condition_id="cond",
+            payload={},
+        )
+    )
+    session.commit()
+
+    assert dispatch_alerts(session, settings) == 1
+    assert [log.notification_key for log in _logs(session)] == [
+        f"{SignalType.LARGE_TAKER_TRADE}:0x5"
+    ]
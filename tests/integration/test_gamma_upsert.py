@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from sqlalchemy import select
+
+from polymercado.ingestion.gamma import parse_market, upsert_markets
+from polymercado.models import Market
+
+
+def test_upsert_markets_skips_unchanged_rows(session):
+    payload = json.loads(
+        Path("tests/fixtures/polymarket/gamma_events.json").read_text()
+    )
+    event = payload[0]
+    values = parse_market(event["markets"][0], event)
+
+    upsert_markets(session, [values])
+    session.commit()
+    market = session.get(Market, values["condition_id"])
+    content_hash = market.content_hash
+    assert content_hash
+
+    upsert_markets(session, [values])
+    session.commit()
+    market = session.get(Market, values["condition_id"])
+    assert market.content_hash == content_hash
+    assert market.last_seen_at > values["last_seen_at"].replace(tzinfo=None)
+
+    upsert_markets(session, [{**values, "title": "Renamed"}])
+    session.commit()
+    title, new_hash = session.execute(select(Market.title, Market.content_hash)).one()
+    assert title == "Renamed"
+    assert new_hash != content_hash
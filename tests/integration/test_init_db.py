@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from polymercado.db import _backfill_signal_dedupe_keys, create_engine_from_url
+from polymercado.models import AppConfig, SignalEvent, SignalType
+from polymercado.utils import utc_now
+
+
+def test_backfill_strips_enum_repr_from_signal_dedupe_keys(session):
+    for signal_type, dedupe_key in (
+        (SignalType.LARGE_TAKER_TRADE, "SignalType.LARGE_TAKER_TRADE:0xabc"),
+        (SignalType.NEW_MARKET, "NEW_MARKET:cond-1"),
+    ):
+        session.add(
+            SignalEvent(
+                signal_type=signal_type,
+                dedupe_key=dedupe_key,
+                created_at=utc_now(),
+                severity=1,
+                payload={},
+            )
+        )
+    session.commit()
+
+    _backfill_signal_dedupe_keys(session.get_bind())
+
+    keys = session.execute(
+        select(SignalEvent.dedupe_key).order_by(SignalEvent.dedupe_key)
+    ).scalars()
+    assert list(keys) == ["LARGE_TAKER_TRADE:0xabc", "NEW_MARKET:cond-1"]
+
+
+def test_backfill_skips_collisions_and_is_idempotent(session):
+    for dedupe_key in (
+        "SignalType.LARGE_TAKER_TRADE:0xabc",
+        "LARGE_TAKER_TRADE:0xabc",
+    ):
+        session.add(
+            SignalEvent(
+                signal_type=SignalType.LARGE_TAKER_TRADE,
+                dedupe_key=dedupe_key,
+                created_at=utc_now(),
+                severity=1,
+                payload={},
+            )
+        )
+    session.commit()
+
+    _backfill_signal_dedupe_keys(session.get_bind())
+    _backfill_signal_dedupe_keys(session.get_bind())
+    assert session.scalar(select(func.count()).select_from(AppConfig)) == 0
+
+    session.add(
+        SignalEvent(
+            signal_type=SignalType.LARGE_TAKER_TRADE,
+            dedupe_key="SignalType.LARGE_TAKER_TRADE:0xdef",
+            created_at=utc_now(),
+            severity=1,
+            payload={},
+        )
+    )
+    session.commit()
+    _backfill_signal_dedupe_keys(session.get_bind())
+
+    keys = session.execute(
+        select(SignalEvent.dedupe_key).order_by(SignalEvent.dedupe_key)
+    ).scalars()
+    assert list(keys) == [
+        "LARGE_TAKER_TRADE:0xabc",
+        "LARGE_TAKER_TRADE:0xdef",
+        "SignalType.LARGE_TAKER_TRADE:0xabc",
+    ]
+
+
+def test_sqlite_engine_provides_ln():
+    engine = create_engine_from_url("sqlite+pysqlite:///:memory:")
+    with engine.connect() as connection:
+        assert connection.scalar(select(func.ln(1.0))) == 0.0
+        assert connection.scalar(select(func.ln(0))) is None
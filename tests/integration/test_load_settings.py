@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from polymercado import config
+from polymercado.config import invalidate_settings_cache, load_settings
+from polymercado.models import AppConfig
+
+
+def test_load_settings_caches_until_invalidated(session):
+    invalidate_settings_cache()
+    session.add(AppConfig(key="MAX_TRACKED_MARKETS", value=25))
+    session.commit()
+
+    settings = load_settings(session)
+    assert settings.MAX_TRACKED_MARKETS == 25
+    assert load_settings(session) is settings
+
+    session.get(AppConfig, "MAX_TRACKED_MARKETS").value = 30
+    session.commit()
+    assert load_settings(session).MAX_TRACKED_MARKETS == 25
+
+    invalidate_settings_cache()
+    assert load_settings(session).MAX_TRACKED_MARKETS == 30
+
+
+def test_load_settings_reloads_after_ttl(session, monkeypatch):
+    invalidate_settings_cache()
+    now = [1000.0]
+    monkeypatch.setattr(config.time, "monotonic", lambda: now[0])
+    monkeypatch.setenv("MAX_TRACKED_MARKETS", "40")
+    assert load_settings(session).MAX_TRACKED_MARKETS == 40
+
+    monkeypatch.setenv("MAX_TRACKED_MARKETS", "50")
+    assert load_settings(session).MAX_TRACKED_MARKETS == 40
+
+    now[0] += config._SETTINGS_CACHE_TTL_SECONDS + 1
+    assert load_settings(session).MAX_TRACKED_MARKETS == 50
+    invalidate_settings_cache()
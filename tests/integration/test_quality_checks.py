@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+
+from polymercado.config import AppSettings
+from polymercado.models import DataQualityIssue, Market, OrderbookLevels, OrderbookSide
+from polymercado.quality import run_data_quality_checks
+
+
+def test_orderbook_price_bounds_reports_first_bad_level_per_book(session):
+    session.add(
+        Market(
+            condition_id="c1",
+            active=True,
+            closed=False,
+            token_ids=["yes", "no"],
+            outcomes=["Yes", "No"],
+        )
+    )
+    books = {
+        ("yes", OrderbookSide.BID): [{"price": "0.4"}, {"price": "1.5"}, {"price": 2}],
+        ("yes", OrderbookSide.ASK): [{"price": "abc"}, ["0.1"], {"price": "0.6"}],
+        ("no", OrderbookSide.BID): [{"price": "-0.2"}],
+        ("no", OrderbookSide.ASK): None,
+    }
+    for (token_id, side), levels in books.items():
+        session.add(
+            OrderbookLevels(
+                token_id=token_id, side=side, condition_id="c1", levels=levels
+            )
+        )
+    session.commit()
+
+    run_data_quality_checks(session, AppSettings(DATA_QUALITY_ENABLED=True))
+
+    messages = session.execute(
+        select(DataQualityIssue.message).where(
+            DataQualityIssue.check_name == "orderbook_price_bounds"
+        )
+    ).scalars()
+    assert list(messages) == [
+        "2 orderbook levels outside [0,1]. Sample: no:-0.2, yes:1.5"
+    ]
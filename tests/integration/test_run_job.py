@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+
+from polymercado.jobs import run_job
+from polymercado.models import JobRun
+
+
+def test_run_job_records_success_then_error(session):
+    assert run_job(session, "sync", lambda _session: 7) == 7
+    job_run = session.get(JobRun, "sync")
+    assert job_run.last_started_at is not None
+    assert job_run.last_success_at is not None
+    assert job_run.last_error is None
+    assert job_run.last_duration_ms is not None
+
+    def fail(_session):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run_job(session, "sync", fail)
+    job_run = session.get(JobRun, "sync")
+    assert job_run.last_error == "boom"
+    assert job_run.last_error_at is not None
+    assert job_run.last_success_at is not None
+
+
+def test_run_job_commits_start_before_the_job_body(session):
+    def job(job_session):
+        assert not job_session.in_transaction()
+        return 0
+
+    run_job(session, "sync", job)
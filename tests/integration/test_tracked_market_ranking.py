@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+
+from polymercado.config import AppSettings
+from polymercado.ingestion.universe import select_tracked_markets
+from polymercado.markets import compute_market_score
+from polymercado.models import Market, MarketMetricsTS
+from polymercado.utils import utc_now
+
+
+def test_sql_ranking_matches_compute_market_score(session):
+    rng = random.Random(7)
+    now = utc_now()
+    settings = AppSettings(
+        TRACKED_MARKETS_CACHE_SECONDS=0,
+        MAX_TRACKED_MARKETS=10,
+        MIN_GAMMA_VOLUME=0,
+        MIN_GAMMA_LIQUIDITY=0,
+        MIN_OPEN_INTEREST=0,
+        MARKET_SCORE_W4=2.5,
+    )
+
+    scores = {}
+    for i in range(30):
+        condition_id = f"c{i:02d}"
+        session.add(Market(condition_id=condition_id, active=True, closed=False))
+        # An older snapshot that must not count towards the score.
+        session.add(
+            MarketMetricsTS(
+                condition_id=condition_id,
+                ts=now - timedelta(hours=1),
+                gamma_volume=1e9,
+                gamma_liquidity=1e9,
+                open_interest=1e9,
+            )
+        )
+        latest = {
+            "gamma_volume": rng.choice([None, rng.uniform(0, 500000)]),
+            "gamma_liquidity": rng.uniform(0, 50000),
+            "open_interest": rng.choice([None, rng.uniform(0, 100000)]),
+            "spread_yes": rng.choice([None, rng.uniform(0, 0.5)]),
+            "spread_no": rng.uniform(0, 0.5),
+        }
+        session.add(MarketMetricsTS(condition_id=condition_id, ts=now, **latest))
+        scores[condition_id] = compute_market_score(
+            latest["gamma_volume"],
+            latest["gamma_liquidity"],
+            latest["open_interest"],
+            latest["spread_yes"],
+            latest["spread_no"],
+            settings.market_score_weights,
+        )
+    session.commit()
+
+    expected = sorted(scores, key=lambda condition_id: -scores[condition_id])
+    assert select_tracked_markets(session, settings) == expected[:10]
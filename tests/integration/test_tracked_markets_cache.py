@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from polymercado.config import AppSettings
+from polymercado.ingestion.universe import (
+    invalidate_tracked_markets_cache,
+    select_tracked_markets,
+)
+from polymercado.models import Market
+
+
+def test_select_tracked_markets_reuses_recent_selection(session):
+    session.add(Market(condition_id="c1", active=True, closed=False))
+    session.commit()
+    settings = AppSettings()
+
+    assert select_tracked_markets(session, settings) == ["c1"]
+
+    session.add(Market(condition_id="c2", active=True, closed=False))
+    session.commit()
+    assert select_tracked_markets(session, settings) == ["c1"]
+    uncached = AppSettings(TRACKED_MARKETS_CACHE_SECONDS=0)
+    assert select_tracked_markets(session, uncached) == ["c1", "c2"]
+
+    invalidate_tracked_markets_cache()
+    assert select_tracked_markets(session, settings) == ["c1", "c2"]
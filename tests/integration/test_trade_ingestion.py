@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from polymercado.config import AppSettings
+from polymercado.ingestion import data_api
+from polymercado.models import SignalEvent, Trade, Wallet
+from polymercado.utils import utc_now
+
+
+def _trade(tx_hash, wallet, size, seconds_ago):
+    return {
+        "transactionHash": tx_hash,
+        "proxyWallet": wallet,
+        "conditionId": "c1",
+        "asset": "t1",
+        "side": "BUY",
+        "price": "0.5",
+        "size": size,
+        "timestamp": int(utc_now().timestamp()) - seconds_ago,
+    }
+
+
+def test_sync_large_trades_inserts_once(session, monkeypatch):
+    pages = {
+        0: [
+            _trade("0x1", "0xa", "40000", 10),
+            _trade("0x2", "0xb", "30000", 20),
+        ],
+        2: [_trade("0x3", "0xa", "20000", 30)],
+    }
+
+    async def fake_fetch_json_async(client, url, params=None):
+        return pages.get(params["offset"], [])
+
+    monkeypatch.setattr(data_api, "fetch_json_async", fake_fetch_json_async)
+    settings = AppSettings(TRADES_PAGE_LIMIT=2)
+
+    assert data_api.sync_large_trades(session, settings) == 3
+    trades = session.execute(select(Trade.trade_pk, Trade.notional_usd)).all()
+    assert sorted(trades) == [
+        ("tx:0x1", Decimal(20000)),
+        ("tx:0x2", Decimal(15000)),
+        ("tx:0x3", Decimal(10000)),
+    ]
+    wallets = session.execute(
+        select(Wallet.wallet, Wallet.lifetime_notional_usd).order_by(Wallet.wallet)
+    ).all()
+    assert wallets == [("0xa", Decimal(30000)), ("0xb", Decimal(15000))]
+    dedupe_keys = session.execute(select(SignalEvent.dedupe_key)).scalars()
+    assert sorted(dedupe_keys) == [
+        f"{signal_type}:tx:{tx_hash}"
+        for signal_type in ("LARGE_NEW_WALLET_TRADE", "LARGE_TAKER_TRADE")
+        for tx_hash in ("0x1", "0x2", "0x3")
+    ]
+
+    assert data_api.sync_large_trades(session, settings) == 0
+    assert session.scalar(select(func.count()).select_from(Trade)) == 3
+    assert session.scalar(select(func.count()).select_from(SignalEvent)) == 6
+    assert session.scalar(
+        select(Wallet.lifetime_notional_usd).where(Wallet.wallet == "0xa")
+    ) == Decimal(30000)
+
+
+def test_sync_large_trades_failure_does_not_advance_cursor(session, monkeypatch):
+    pages = {
+        0: [
+            _trade("0x1", "0xa", "40000", 10),
+            _trade("0x2", "0xb", "30000", 20),
+        ],
+        2: [_trade("0x3", "0xa", "20000", 30)],
+    }
+    failures = [RuntimeError("upstream timeout")]
+
+    async def fake_fetch_json_async(client, url, params=None):
+        if params["offset"] == 2 and failures:
+            raise failures.pop()
+        return pages.get(params["offset"], [])
+
+    monkeypatch.setattr(data_api, "fetch_json_async", fake_fetch_json_async)
+    settings = AppSettings(TRADES_PAGE_LIMIT=2)
+
+    with pytest.raises(RuntimeError):
+        data_api.sync_large_trades(session, settings)
+    session.rollback()
+    assert session.scalar(select(func.count()).select_from(Trade)) == 0
+
+    assert data_api.sync_large_trades(session, settings) == 3
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from polymercado.config import AppSettings
+from polymercado.ingestion import data_api
+from polymercado.models import Wallet, WalletMarketExposure
+from polymercado.utils import utc_now
+
+
+def _exposures(session):
+    rows = session.execute(
+        select(WalletMarketExposure).order_by(
+            WalletMarketExposure.wallet, WalletMarketExposure.condition_id
+        )
+    ).scalars()
+    return [(row.wallet, row.condition_id, row.net_shares) for row in rows]
+
+
+def test_sync_wallet_positions_replaces_closed_exposures(session, monkeypatch):
+    now = utc_now()
+    for address in ("0xa", "0xb"):
+        session.add(
+            Wallet(
+                wallet=address,
+                first_seen_at=now,
+                last_seen_at=now,
+                tracked_until=now + timedelta(days=1),
+                lifetime_notional_usd=0,
+            )
+        )
+    session.commit()
+
+    responses = {
+        "0xa": [
+            {"conditionId": "c1", "size": "10", "avgPrice": "0.5", "outcome": "Yes"},
+            {"conditionId": "c2", "size": "4", "avgPrice": "0.2", "outcome": "No"},
+        ],
+        "0xb": [
+            {"conditionId": "c1", "size": "3", "avgPrice": "0.4", "outcome": "Yes"},
+        ],
+    }
+
+    async def fake_fetch_all(settings, url, params_list):
+        return [responses[params["user"]] for params in params_list]
+
+    monkeypatch.setattr(data_api, "_fetch_all", fake_fetch_all)
+    settings = AppSettings()
+
+    assert data_api.sync_wallet_positions(session, settings) == 3
+    assert _exposures(session) == [
+        ("0xa", "c1", Decimal(10)),
+        ("0xa", "c2", Decimal(-4)),
+        ("0xb", "c1", Decimal(3)),
+    ]
+
+    responses["0xa"] = [
+        {"conditionId": "c1", "size": "12", "avgPrice": "0.5", "outcome": "Yes"},
+    ]
+    responses["0xb"] = []
+
+    assert data_api.sync_wallet_positions(session, settings) == 1
+    assert _exposures(session) == [("0xa", "c1", Decimal(12))]
@@ -3,7 +3,13 @@ from __future__ import annotations
 from decimal import Decimal
 
 from polymercado.config import AppSettings
-from polymercado.signals.arb import avg_ask, compute_arb, normalize_levels
+from polymercado.signals.arb import (
+    avg_ask,
+    compute_arb,
+    compute_arb_cached,
+    normalize_levels,
+    normalize_levels_cached,
+)
 
 
 def test_avg_ask_partial_fill():
@@ -27,3 +33,54 @@ def test_compute_arb_detects_edge():
     assert result["q_max"] == Decimal("100")
     assert result["edge_at_q_max"] is not None
     assert result["edge_at_q_max"] > Decimal("0.01")
+
+
+def test_compute_arb_walks_multi_level_books():
+    settings = AppSettings(ARB_EDGE_MIN=0.01, ARB_MIN_EXECUTABLE_SHARES=10)
+    asks_yes = normalize_levels(
+        [{"price": "0.40", "size": "30"}, {"price": "0.55", "size": "50"}]
+    )
+    asks_no = normalize_levels(
+        [{"price": "0.45", "size": "20"}, {"price": "0.50", "size": "100"}]
+    )
+
+    result = compute_arb(asks_yes, asks_no, settings)
+    assert result["q_max"] == Decimal(80)
+    assert result["avg_ask_yes_at_q_max"] == avg_ask(asks_yes, Decimal(80))
+    assert result["avg_ask_no_at_q_max"] == avg_ask(asks_no, Decimal(80))
+    assert result["edge_at_min_q"] == Decimal("0.15")
+
+
+def test_compute_arb_edge_equal_to_threshold_is_not_an_arb():
+    settings = AppSettings(ARB_EDGE_MIN=0.01, ARB_MIN_EXECUTABLE_SHARES=10)
+    asks_yes = normalize_levels([{"price": "0.49", "size": "100"}])
+    asks_no = normalize_levels([{"price": "0.50", "size": "100"}])
+
+    result = compute_arb(asks_yes, asks_no, settings)
+    assert result["edge_at_min_q"] == Decimal("0.01")
+    assert result["q_max"] is None
+
+
+def test_compute_arb_cached_reuses_result_per_book_key():
+    settings = AppSettings(ARB_EDGE_MIN=0.01, ARB_MIN_EXECUTABLE_SHARES=50)
+    asks_yes = normalize_levels([{"price": "0.49", "size": "100"}])
+    asks_no = normalize_levels([{"price": "0.49", "size": "100"}])
+
+    first = compute_arb_cached(asks_yes, asks_no, ("y", "h1", "n", "h2"), settings)
+    assert first == compute_arb(asks_yes, asks_no, settings)
+
+    # Same key: the cached result wins even if the levels passed differ.
+    cached = compute_arb_cached([], [], ("y", "h1", "n", "h2"), settings)
+    assert cached == first
+
+    stricter = AppSettings(ARB_EDGE_MIN=0.03, ARB_MIN_EXECUTABLE_SHARES=50)
+    assert compute_arb_cached([], [], ("y", "h1", "n", "h2"), stricter)["q_max"] is None
+
+
+def test_normalize_levels_cached_keys_on_book_hash():
+    levels = [{"price": "0.40", "size": "5"}, {"price": "0", "size": "1"}]
+
+    normalized = normalize_levels_cached(levels, ("t", "ASK", "h1"))
+    assert normalized == normalize_levels(levels)
+    assert normalize_levels_cached([], ("t", "ASK", "h1")) == normalized
+    assert normalize_levels_cached([], ("t", "ASK", "h2")) == []
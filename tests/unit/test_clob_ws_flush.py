@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from polymercado.config import AppSettings
+from polymercado.ingestion import clob_ws
+from polymercado.ingestion.clob_ws import OrderbookWebsocket
+
+
+def test_flush_loop_backs_off_and_drops_failed_books(monkeypatch):
+    websocket = OrderbookWebsocket(AppSettings(), session_factory=None)
+    sleeps: list[float] = []
+    outcomes = [False, False, False, True]
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    def flush_books() -> None:
+        websocket._dirty.add("t1")
+        if len(sleeps) == len(outcomes):
+            websocket._stop_event.set()
+        if not outcomes[len(sleeps) - 1]:
+            raise OperationalError("UPDATE", {}, Exception("database is locked"))
+        websocket._dirty.clear()
+
+    monkeypatch.setattr(clob_ws.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(websocket, "_flush_books", flush_books)
+
+    asyncio.run(websocket._flush_loop())
+
+    assert sleeps == [0.1, 0.2, 0.4, 0.8]
+    assert websocket._dirty == set()
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.rollbacks = 0
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+def test_flush_loop_survives_non_database_errors(monkeypatch):
+    websocket = OrderbookWebsocket(AppSettings(), session_factory=None)
+    websocket._session = _FakeSession()
+    sleeps: list[float] = []
+    upserts: list[int] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        websocket._book_cache["t1"] = {"asset_id": "t1", "market": "c1"}
+        websocket._dirty.add("t1")
+        if len(sleeps) == 3:
+            websocket._stop_event.set()
+
+    def fake_upsert(session, books, stored_hashes) -> None:
+        upserts.append(len(books))
+        if len(upserts) < 3:
+            raise ValueError("malformed level")
+
+    monkeypatch.setattr(clob_ws.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(clob_ws, "upsert_orderbooks", fake_upsert)
+
+    asyncio.run(websocket._flush_loop())
+
+    assert upserts == [1, 1, 1]
+    assert sleeps == [0.1, 0.2, 0.4]
+    assert websocket._session.rollbacks == 2
+    assert websocket._dirty == set()
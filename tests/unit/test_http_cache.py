@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import httpx
+
+from polymercado.ingestion.http import fetch_json
+
+
+def test_fetch_json_caches_only_when_ttl_given():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        return httpx.Response(200, json=[{"id": len(calls)}])
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    url = "https://example.test/cache-ttl"
+
+    assert fetch_json(client, url, params={"a": 1}, cache_ttl=60) == [{"id": 1}]
+    assert fetch_json(client, url, params={"a": 1}, cache_ttl=60) == [{"id": 1}]
+    assert fetch_json(client, url, params={"a": 2}, cache_ttl=60) == [{"id": 2}]
+    assert fetch_json(client, url, params={"a": 1}) == [{"id": 3}]
+    assert len(calls) == 3
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from polymercado.ingestion import http
+from polymercado.ingestion.http import fetch_json
+
+
+def _client(responses: list[httpx.Response]) -> tuple[httpx.Client, list[str]]:
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        return responses[len(calls) - 1]
+
+    return httpx.Client(transport=httpx.MockTransport(handler)), calls
+
+
+def test_fetch_json_does_not_retry_client_errors(monkeypatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(http.time, "sleep", sleeps.append)
+    client, calls = _client([httpx.Response(404)])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch_json(client, "https://example.test/missing")
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_fetch_json_honours_retry_after(monkeypatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(http.time, "sleep", sleeps.append)
+    client, calls = _client(
+        [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(503),
+            httpx.Response(200, json={"ok": True}),
+        ]
+    )
+
+    assert fetch_json(client, "https://example.test/busy") == {"ok": True}
+    assert len(calls) == 3
+    assert sleeps[0] == 2.0
+    assert 0.5 <= sleeps[1] <= 1.0
+
+
+def test_fetch_json_async_shares_retry_policy(monkeypatch):
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr(http.asyncio, "sleep", fake_sleep)
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(200, json={"ok": True}),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    async def run() -> object:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await http.fetch_json_async(client, "https://example.test/busy")
+
+    assert asyncio.run(run()) == {"ok": True}
+    assert sleeps == [2.0]
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import asyncio
+
+from polymercado.ingestion.http import run_coroutine
+
+
+async def _answer() -> int:
+    await asyncio.sleep(0)
+    return 42
+
+
+def test_run_coroutine_without_running_loop():
+    assert run_coroutine(_answer()) == 42
+
+
+def test_run_coroutine_inside_running_loop():
+    async def caller() -> int:
+        return run_coroutine(_answer())
+
+    assert asyncio.run(caller()) == 42